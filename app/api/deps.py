@@ -1,5 +1,12 @@
+import threading
+
 from app.core.config import settings
-from app.storage.database import Database
+from app.storage.database import (
+    ConnectionPool,
+    Database,
+    PooledDatabase,
+    file_identity,
+)
 
 
 class DatabaseConfig:
@@ -18,11 +25,46 @@ class DatabaseConfig:
         cls._test_db_path = path
 
 
+# One pool per database file, with the file identity it was initialized against
+_pools: dict[str, tuple[ConnectionPool, tuple[int, int] | None]] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(db_path: str) -> ConnectionPool:
+    """Get the connection pool for a database, initializing it on first use.
+
+    A pool is rebuilt when the file is replaced (e.g. a restore renames the
+    old database away), so pooled connections never follow a stale file.
+    """
+    with _pools_lock:
+        entry = _pools.get(db_path)
+        current_id = file_identity(db_path)
+        if entry is not None and current_id is not None and entry[1] == current_id:
+            return entry[0]
+
+        if entry is not None:
+            entry[0].close_all()
+        pool = ConnectionPool(db_path)
+        db = PooledDatabase(pool)
+        try:
+            db.initialize()
+        finally:
+            db.close()
+        _pools[db_path] = (pool, file_identity(db_path))
+        return pool
+
+
 def get_db() -> Database:
-    """Get database connection."""
-    db = Database(DatabaseConfig.get_path())
-    db.initialize()
-    return db
+    """Get a database handle backed by a pooled connection."""
+    return PooledDatabase(_get_pool(DatabaseConfig.get_path()))
+
+
+def close_db_pools() -> None:
+    """Close all pooled connections and forget initialized databases."""
+    with _pools_lock:
+        for pool, _ in _pools.values():
+            pool.close_all()
+        _pools.clear()
 
 
 def set_test_db_path(path: str | None) -> None:
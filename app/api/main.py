@@ -1,5 +1,7 @@
 """FastAPI application factory."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
@@ -7,6 +9,7 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import ValidationError
 
+from app.api.deps import close_db_pools
 from app.api.routers import (
     categories,
     email,
@@ -24,11 +27,22 @@ from app.api.routers import (
 from app.core.error_logger import log_error_to_db
 from app.core.scheduler import lifespan_scheduler
 
+
+@asynccontextmanager
+async def lifespan(app_: FastAPI) -> AsyncIterator[None]:
+    """Run the scheduler lifespan, then close pooled database connections."""
+    try:
+        async with lifespan_scheduler(app_):
+            yield
+    finally:
+        close_db_pools()
+
+
 app = FastAPI(
     title="Price Spy",
     description="Visual price tracking with AI",
     version="0.3.0",
-    lifespan=lifespan_scheduler,
+    lifespan=lifespan,
 )
 
 # Include API routers
@@ -1,6 +1,5 @@
 import os
 import time
-from pathlib import Path
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -8,7 +7,7 @@ from pydantic import BaseModel
 
 from app.api.deps import get_db
 from app.core.batch_extraction import extract_all_items, get_batch_summary
-from app.core.browser import capture_screenshot
+from app.core.browser import capture_screenshot, save_screenshot
 from app.core.config import settings
 from app.core.error_logger import log_error_to_db
 from app.core.rate_limiter import RateLimitTracker
@@ -123,9 +122,7 @@ async def run_extraction(item_id: int, db_path: str):
         )
 
         # Save screenshot
-        screenshot_path = Path(f"screenshots/{item_id}.png")
-        screenshot_path.parent.mkdir(parents=True, exist_ok=True)
-        screenshot_path.write_bytes(screenshot_bytes)
+        screenshot_path = await save_screenshot(item_id, screenshot_bytes)
 
         context.screenshot_path = str(screenshot_path)
 
@@ -173,7 +170,7 @@ async def trigger_batch_extraction(db: Annotated[Database, Depends(get_db)]):
 @router.post("/{item_id}", response_model=ExtractResponse)
 async def trigger_extraction(item_id: int, db: Annotated[Database, Depends(get_db)]):
     """Run price extraction for a tracked item with rate limiting and logging."""
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     model_used = None
 
     try:
@@ -224,9 +221,7 @@ async def trigger_extraction(item_id: int, db: Annotated[Database, Depends(get_d
             )
 
             # Save screenshot
-            screenshot_path = Path(f"screenshots/{item_id}.png")
-            screenshot_path.parent.mkdir(parents=True, exist_ok=True)
-            screenshot_path.write_bytes(screenshot_bytes)
+            screenshot_path = await save_screenshot(item_id, screenshot_bytes)
 
             context.screenshot_path = str(screenshot_path)
 
@@ -235,24 +230,22 @@ async def trigger_extraction(item_id: int, db: Annotated[Database, Depends(get_d
                 screenshot_bytes, api_key, tracker, context=context
             )
 
-            duration_ms = int((time.time() - start_time) * 1000)
-
-            # Save to price history
-            _save_extraction_result(price_repo, result, item.url)
-
-            # Log successful extraction
-            log_repo.insert(
-                ExtractionLog(
-                    tracked_item_id=item_id,
-                    status="success",
-                    model_used=model_used,
-                    price=result.price,
-                    currency=result.currency,
-                    duration_ms=duration_ms,
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+
+            # Price, log and last-checked timestamp land in a single commit
+            with db.transaction():
+                _save_extraction_result(price_repo, result, item.url)
+                log_repo.insert(
+                    ExtractionLog(
+                        tracked_item_id=item_id,
+                        status="success",
+                        model_used=model_used,
+                        price=result.price,
+                        currency=result.currency,
+                        duration_ms=duration_ms,
+                    )
                 )
-            )
-
-            tracked_repo.set_last_checked(item_id)
+                tracked_repo.set_last_checked(item_id)
 
             return ExtractResponse(
                 status="success",
@@ -262,7 +255,7 @@ async def trigger_extraction(item_id: int, db: Annotated[Database, Depends(get_d
             )
 
         except Exception as e:
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             error_msg = str(e)
 
             # Log failed extraction
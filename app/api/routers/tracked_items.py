@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from app.api.deps import get_db
 from app.models.schemas import (
+    Product,
     TrackedItem,
     TrackedItemCreate,
     TrackedItemResponse,
@@ -11,7 +12,6 @@ from app.models.schemas import (
 )
 from app.storage.database import Database
 from app.storage.repositories import (
-    CategoryRepository,
     ProductRepository,
     StoreRepository,
     TrackedItemRepository,
@@ -20,25 +20,46 @@ from app.storage.repositories import (
 router = APIRouter(prefix="/api/tracked-items", tags=["Tracked Items"])
 
 
+def _validate_size_sensitivity(product: Product, item_in: TrackedItemCreate) -> None:
+    """Ensure target_size is set only for size-sensitive product categories."""
+    if not product.category:
+        return
+
+    if product.is_size_sensitive:
+        if not item_in.target_size:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Product category '{product.category}' is size-sensitive. "
+                    "'target_size' is required."
+                ),
+            )
+    elif item_in.target_size:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Product category '{product.category}' is NOT size-sensitive. "
+                "'target_size' must be empty."
+            ),
+        )
+
+
 @router.get("", response_model=list[TrackedItemResponse])
-async def get_items(db: Annotated[Database, Depends(get_db)]):
+def get_items(db: Annotated[Database, Depends(get_db)]):
     """Get all tracked items with their labels."""
     try:
         repo = TrackedItemRepository(db)
-        items = repo.get_all()
-        result = []
-        for item in items:
-            # Map TrackedItem to TrackedItemResponse manually or using helper
-            item_dict = item.model_dump()
-            item_dict["labels"] = repo.get_labels(int(item.id or 0))
-            result.append(TrackedItemResponse(**item_dict))
-        return result
+        # Rows were validated on write; skip re-validating them here
+        return [
+            TrackedItemResponse.model_construct(**item.model_dump(), labels=labels)
+            for item, labels in repo.get_all_with_labels()
+        ]
     finally:
         db.close()
 
 
 @router.get("/{item_id}", response_model=TrackedItemResponse)
-async def get_item(item_id: int, db: Annotated[Database, Depends(get_db)]):
+def get_item(item_id: int, db: Annotated[Database, Depends(get_db)]):
     """Get a single tracked item by ID with its labels."""
     try:
         repo = TrackedItemRepository(db)
@@ -48,15 +69,13 @@ async def get_item(item_id: int, db: Annotated[Database, Depends(get_db)]):
 
         item_dict = item.model_dump()
         item_dict["labels"] = repo.get_labels(int(item.id or 0))
-        return TrackedItemResponse(**item_dict)
+        return TrackedItemResponse.model_construct(**item_dict)
     finally:
         db.close()
 
 
 @router.post("", response_model=TrackedItemResponse, status_code=201)
-async def create_item(
-    item_in: TrackedItemCreate, db: Annotated[Database, Depends(get_db)]
-):
+def create_item(item_in: TrackedItemCreate, db: Annotated[Database, Depends(get_db)]):
     """Create a new tracked item and associate labels."""
     try:
         # Validate product and store exist
@@ -66,28 +85,7 @@ async def create_item(
             raise HTTPException(status_code=404, detail="Product not found")
 
         # Size sensitivity validation
-        cat_repo = CategoryRepository(db)
-        if product.category:
-            category = cat_repo.get_by_name(product.category)
-            is_size_sensitive = category.is_size_sensitive if category else False
-
-            if is_size_sensitive:
-                if not item_in.target_size:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=(
-                            f"Product category '{product.category}' is size-sensitive. "
-                            "'target_size' is required."
-                        ),
-                    )
-            elif item_in.target_size:
-                raise HTTPException(
-                    status_code=400,
-                    detail=(
-                        f"Product category '{product.category}' is NOT size-sensitive. "
-                        "'target_size' must be empty."
-                    ),
-                )
+        _validate_size_sensitivity(product, item_in)
 
         store_repo = StoreRepository(db)
         if not store_repo.get_by_id(item_in.store_id):
@@ -115,23 +113,21 @@ async def create_item(
         item_id = repo.insert(item_obj)
 
         # Associate labels if provided
+        item_dict = item_obj.model_dump()
+        item_dict["id"] = item_id
+        item_dict["labels"] = []
         if item_in.label_ids:
             repo.set_labels(item_id, item_in.label_ids)
+            item_dict["labels"] = repo.get_labels(item_id)
 
-        created = repo.get_by_id(item_id)
-        if not created:
-            raise HTTPException(
-                status_code=500, detail="Failed to retrieve created item"
-            )
-        item_dict = created.model_dump()
-        item_dict["labels"] = repo.get_labels(int(item_id))
+        # The written row is already known, so no re-fetch is needed
         return TrackedItemResponse(**item_dict)
     finally:
         db.close()
 
 
 @router.put("/{item_id}", response_model=TrackedItemResponse)
-async def update_item(
+def update_item(
     item_id: int,
     item_in: TrackedItemCreate,
     db: Annotated[Database, Depends(get_db)],
@@ -149,28 +145,7 @@ async def update_item(
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
 
-        cat_repo = CategoryRepository(db)
-        if product.category:
-            category = cat_repo.get_by_name(product.category)
-            is_size_sensitive = category.is_size_sensitive if category else False
-
-            if is_size_sensitive:
-                if not item_in.target_size:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=(
-                            f"Product category '{product.category}' is size-sensitive. "
-                            f"'target_size' is required."
-                        ),
-                    )
-            elif item_in.target_size:
-                raise HTTPException(
-                    status_code=400,
-                    detail=(
-                        f"Product category '{product.category}' is NOT size-sensitive. "
-                        f"'target_size' must be empty."
-                    ),
-                )
+        _validate_size_sensitivity(product, item_in)
 
         item_obj = TrackedItem(
             product_id=item_in.product_id,
@@ -188,20 +163,18 @@ async def update_item(
         if item_in.label_ids is not None:
             repo.set_labels(item_id, item_in.label_ids)
 
-        updated = repo.get_by_id(item_id)
-        if not updated:
-            raise HTTPException(
-                status_code=404, detail="Tracked item not found after operation"
-            )
-        item_dict = updated.model_dump()
-        item_dict["labels"] = repo.get_labels(int(item_id))
+        # update() leaves last_checked_at untouched, so carry it over
+        item_dict = item_obj.model_dump()
+        item_dict["id"] = item_id
+        item_dict["last_checked_at"] = existing.last_checked_at
+        item_dict["labels"] = repo.get_labels(item_id)
         return TrackedItemResponse(**item_dict)
     finally:
         db.close()
 
 
 @router.patch("/{item_id}", response_model=TrackedItemResponse)
-async def patch_item(
+def patch_item(
     item_id: int,
     item_patch: TrackedItemUpdate,
     db: Annotated[Database, Depends(get_db)],
@@ -217,21 +190,17 @@ async def patch_item(
         # Pop label_ids as it's handled separately
         label_ids = update_data.pop("label_ids", None)
 
+        updated = existing
         if update_data:
-            current_data = existing.model_dump()
-            for key, value in update_data.items():
-                current_data[key] = value
-
-            repo.update(item_id, TrackedItem(**current_data))
+            # Validate the merged item so a patch cannot store what create rejects
+            updated = TrackedItem.model_validate(
+                {**existing.model_dump(), **update_data}
+            )
+            repo.update(item_id, updated)
 
         if label_ids is not None:
             repo.set_labels(item_id, label_ids)
 
-        updated = repo.get_by_id(item_id)
-        if not updated:
-            raise HTTPException(
-                status_code=404, detail="Tracked item not found after operation"
-            )
         item_dict = updated.model_dump()
         item_dict["labels"] = repo.get_labels(item_id)
         return TrackedItemResponse(**item_dict)
@@ -240,7 +209,7 @@ async def patch_item(
 
 
 @router.delete("/{item_id}")
-async def delete_item(item_id: int, db: Annotated[Database, Depends(get_db)]):
+def delete_item(item_id: int, db: Annotated[Database, Depends(get_db)]):
     """
     Delete a tracked item. Labels remain but association is removed via
     labels CASCADE or repository cleanup.
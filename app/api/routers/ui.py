@@ -1,13 +1,21 @@
+import heapq
+import os
+import re
 from collections import defaultdict
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import groupby
 from pathlib import Path
 from typing import Annotated, Any, TypedDict, cast
 
 from fastapi import APIRouter, Depends, Request
+from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from pydantic import BaseModel
 
 from app.api.deps import get_db
+from app.core.config import settings
 from app.core.price_calculator import (
     calculate_volume_price,
     normalize_unit,
@@ -20,14 +28,45 @@ from app.storage.repositories import (
     StoreRepository,
     TrackedItemRepository,
 )
+from app.utils.cache import TTLCache
 
 router = APIRouter(tags=["UI"])
 
 # Templates directory (assuming it's in app/templates)
 templates_dir = Path(__file__).parent.parent.parent / "templates"
-templates = Jinja2Templates(directory=str(templates_dir))
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader(str(templates_dir)),
+        autoescape=True,
+        auto_reload=settings.TEMPLATES_AUTO_RELOAD,
+        # Reuse compiled templates across restarts (cold starts on the Pi)
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+)
+
+# Compile page templates once at import so requests only hit the cache
+PAGE_TEMPLATES = (
+    "dashboard.html",
+    "admin.html",
+    "products.html",
+    "timeline.html",
+    "tracked-items.html",
+)
+for _page in PAGE_TEMPLATES:
+    templates.get_template(_page)
 
 MIN_HISTORY_FOR_TREND = 2
+PAGE_CACHE_TTL_SECONDS = 30
+SCREENSHOTS_DIR = "screenshots"
+SCREENSHOT_EXTENSIONS = ("jpg", "png")
+
+# Rendered data pages keyed by (page, db path, data version): any commit invalidates
+_page_cache = TTLCache(ttl_seconds=PAGE_CACHE_TTL_SECONDS)
+
+LOW_STOCK_KEYWORDS = ("low stock", "units left", "stock low", "only", "last units")
+_LOW_STOCK_RE = re.compile(
+    "|".join(re.escape(kw) for kw in LOW_STOCK_KEYWORDS), re.IGNORECASE
+)
 
 
 class Deal(TypedDict):
@@ -67,19 +106,13 @@ class DashboardItem(BaseModel):
     is_best_deal: bool = False
 
 
-def _get_chart_color(index: int) -> str:
-    """Get a color for chart lines based on index."""
-    colors = [
-        "#3B82F6",  # Blue
-        "#10B981",  # Green
-        "#F59E0B",  # Amber
-        "#EF4444",  # Red
-        "#8B5CF6",  # Purple
-        "#EC4899",  # Pink
-        "#06B6D4",  # Cyan
-        "#84CC16",  # Lime
-    ]
-    return colors[index % len(colors)]
+# Chart line colors, one per hue, formatted once at import
+_HSL_TABLE = tuple(f"hsl({hue}, 70%, 50%)" for hue in range(360))
+
+
+def _hsl_for(item_id: int) -> str:
+    """Get a stable chart line color for a tracked item."""
+    return _HSL_TABLE[(item_id * 137) % 360]
 
 
 def _calculate_trend(
@@ -133,23 +166,12 @@ def _check_stock_warnings(
     latest_price_rec: Any, product_name: str, store_name: str
 ) -> dict[str, Any] | None:
     """Check for low stock keywords in notes."""
-    if not latest_price_rec or not latest_price_rec.notes:
-        return None
-
-    notes_lower = latest_price_rec.notes.lower()
-    low_stock_keywords = [
-        "low stock",
-        "units left",
-        "stock low",
-        "only",
-        "last units",
-    ]
-
-    if any(kw in notes_lower for kw in low_stock_keywords):
+    notes = latest_price_rec.notes if latest_price_rec else None
+    if notes and _LOW_STOCK_RE.search(notes):
         return {
             "product_name": product_name,
             "store_name": store_name,
-            "notes": latest_price_rec.notes,
+            "notes": notes,
         }
     return None
 
@@ -164,23 +186,44 @@ def _build_graph_dataset(
     if not history:
         return None
 
-    item_label = f"{product_name} ({store_name})"
+    # Oldest first; isoformat is much cheaper than strftime, slice off any offset
+    chronological = history[::-1]
+    timestamps = [h.created_at.isoformat(" ", "minutes")[:16] for h in chronological]
+
     dataset: dict[str, Any] = {
-        "label": item_label,
-        "data": [],
-        "borderColor": f"hsl({(int(item_id or 0) * 137) % 360}, 70%, 50%)",
+        "label": f"{product_name} ({store_name})",
+        "data": [
+            {"x": ts, "y": h.price}
+            for ts, h in zip(timestamps, chronological, strict=True)
+        ],
+        "borderColor": _hsl_for(item_id),
         "fill": False,
         "tension": 0.1,
     }
-    timestamps = []
-    for h in reversed(history):
-        ts = h.created_at.strftime("%Y-%m-%d %H:%M")
-        timestamps.append(ts)
-        dataset["data"].append({"x": ts, "y": h.price})
 
     return dataset, timestamps
 
 
+def _get_screenshot_files() -> dict[int, str]:
+    """Map tracked item IDs to their screenshot file name, in a single dir scan.
+
+    Screenshots are JPEG; PNGs from before the switch are still shown until
+    the item's next extraction replaces them.
+    """
+    files: dict[int, str] = {}
+    try:
+        with os.scandir(SCREENSHOTS_DIR) as entries:
+            for entry in entries:
+                stem, _, ext = entry.name.rpartition(".")
+                if ext not in SCREENSHOT_EXTENSIONS or not stem.isdigit():
+                    continue
+                if ext == "jpg" or int(stem) not in files:
+                    files[int(stem)] = entry.name
+    except FileNotFoundError:
+        pass
+    return files
+
+
 def _ensure_product_in_map(product: Any, products_map: dict[int, dict]) -> int:
     """Ensure product exists in the map and return its ID."""
     pid = int(product.id or 0)
@@ -197,310 +240,324 @@ def _ensure_product_in_map(product: Any, products_map: dict[int, dict]) -> int:
 
 
 def _build_item_dict(
-    item: TrackedItem,
-    store_name: str,
-    latest_price_rec: Any,
-    metrics: dict,
-    product: Any,
-    screenshot_path: str,
-) -> dict[str, Any]:
-    """Build the dictionary representation of a tracked item."""
-    price = metrics["price"]
-    original_price = metrics["original_price"]
-    deal_type = metrics["deal_type"]
-
-    # Deal Logic
-    is_price_drop = metrics["trend"] == "down"
-    is_deal = False
-    if price is not None:
-        has_original_higher = original_price is not None and original_price > price
-        has_deal_type = deal_type is not None and deal_type.lower() != "none"
-        is_deal = has_original_higher or has_deal_type
-
-    has_screenshot = Path(screenshot_path).exists()
-
-    return {
-        "id": item.id,
-        "store_name": store_name,
-        "url": item.url,
-        "price": price,
-        "currency": metrics["currency"],
-        "unit_price": metrics["unit_price"],
-        "unit": metrics["unit"],
-        "target_unit": product.target_unit,
-        "trend": metrics["trend"],
-        "is_deal": is_deal,
-        "is_price_drop": is_price_drop,
-        "is_target_hit": metrics["is_target_hit"],
-        "is_best_deal": False,
-        "is_available": latest_price_rec.is_available if latest_price_rec else None,
-        "is_size_matched": latest_price_rec.is_size_matched
-        if latest_price_rec
-        else True,
-        "notes": latest_price_rec.notes if latest_price_rec else None,
-        "screenshot_path": screenshot_path if has_screenshot else None,
-        "original_price": original_price,
-        "deal_type": deal_type,
-        "deal_description": latest_price_rec.deal_description
-        if latest_price_rec
-        else None,
-    }
-
-
-def _calculate_item_metrics(
     item: TrackedItem,
     product: Any,
     store_name: str,
     latest_price_rec: Any,
     history: list[PriceHistoryRecord],
     warnings_list: list[dict],
+    screenshot_path: str | None,
 ) -> dict[str, Any]:
-    """Calculate price metrics, trend, and target hit status."""
-    current_currency = latest_price_rec.currency if latest_price_rec else "EUR"
-    trend, warning = _calculate_trend(
-        history, str(product.name), store_name, current_currency
-    )
+    """Build the dashboard dict for a tracked item, with metrics and trend."""
+    # Read each price record attribute once
+    lpr = latest_price_rec
+    if lpr:
+        price = lpr.price
+        currency = lpr.currency
+        original_price = lpr.original_price
+        deal_type = lpr.deal_type
+        is_available = lpr.is_available
+        is_size_matched = lpr.is_size_matched
+        notes = lpr.notes
+        deal_description = lpr.deal_description
+    else:
+        price = original_price = deal_type = is_available = None
+        notes = deal_description = None
+        currency = "EUR"
+        is_size_matched = True
 
+    trend, warning = _calculate_trend(history, str(product.name), store_name, currency)
     if warning:
         warnings_list.append(warning)
 
     unit_price = None
     unit = None
-    if latest_price_rec and latest_price_rec.price:
+    if price:
         unit_price, unit = calculate_volume_price(
-            latest_price_rec.price,
+            price,
             item.items_per_lot,
             item.quantity_size,
             item.quantity_unit,
         )
         unit_price = round(unit_price, 2)
 
-    price = latest_price_rec.price if latest_price_rec else None
-
-    # Check Target Hit
-    is_target_hit = _check_target_hit(price, unit_price, unit, product)
+    # Deal Logic
+    is_deal = False
+    if price is not None:
+        has_original_higher = original_price is not None and original_price > price
+        has_deal_type = deal_type is not None and deal_type.lower() != "none"
+        is_deal = has_original_higher or has_deal_type
 
     return {
-        "trend": trend,
-        "currency": current_currency,
+        "id": item.id,
+        "store_name": store_name,
+        "url": item.url,
+        "price": price,
+        "currency": currency,
         "unit_price": unit_price,
         "unit": unit,
-        "price": price,
-        "original_price": latest_price_rec.original_price if latest_price_rec else None,
-        "deal_type": latest_price_rec.deal_type if latest_price_rec else None,
-        "is_target_hit": is_target_hit,
+        "target_unit": product.target_unit,
+        "trend": trend,
+        "is_deal": is_deal,
+        "is_price_drop": trend == "down",
+        "is_target_hit": _check_target_hit(price, unit_price, unit, product),
+        "is_best_deal": False,
+        "is_available": is_available,
+        "is_size_matched": is_size_matched,
+        "notes": notes,
+        "screenshot_path": screenshot_path,
+        "original_price": original_price,
+        "deal_type": deal_type,
+        "deal_description": deal_description,
     }
 
 
 def _process_dashboard_item(
     item: TrackedItem,
-    repos: dict[str, Any],
+    lookups: dict[str, dict],
     products_map: dict[int, dict],
     warnings: dict[str, list[dict]],
     graph_info: dict[str, Any],
 ) -> None:
-    """Process a single tracked item for the dashboard."""
-    if not item.is_active:
-        return
-
-    product = repos["product"].get_by_id(item.product_id)
+    """Process a single active tracked item for the dashboard."""
+    product = lookups["products"].get(item.product_id)
     if not product:
         return
 
     pid = _ensure_product_in_map(product, products_map)
 
-    store = repos["store"].get_by_id(item.store_id)
-    latest_price_rec = repos["price"].get_latest_by_url(item.url)
-    history = repos["price"].get_history_since(item.url, graph_info["cutoff"])
+    store = lookups["stores"].get(item.store_id)
+    latest_price_rec = lookups["latest_prices"].get(item.url)
+    history = lookups["histories"].get(item.url, [])
     store_name = store.name if store else "Unknown"
+    product_name = str(product.name)
+
+    # Screenshot Path
+    screenshot_file = graph_info["screenshot_files"].get(item.id)
+    screenshot_path = (
+        f"{SCREENSHOTS_DIR}/{screenshot_file}" if screenshot_file else None
+    )
 
-    # Calculate metrics & Trend
-    metrics = _calculate_item_metrics(
+    # Add to Map
+    item_dict = _build_item_dict(
         item,
         product,
         store_name,
         latest_price_rec,
         history,
         warnings["price_increase"],
-    )
-
-    # Screenshot Path
-    screenshot_path = f"screenshots/{item.id}.png"
-
-    # Add to Map
-    item_dict = _build_item_dict(
-        item, store_name, latest_price_rec, metrics, product, screenshot_path
+        screenshot_path,
     )
     products_map[pid]["tracked_items"].append(item_dict)
 
     # Check Stock Warnings
-    stock_warning = _check_stock_warnings(
-        latest_price_rec, str(product.name), store_name
-    )
+    stock_warning = _check_stock_warnings(latest_price_rec, product_name, store_name)
     if stock_warning:
         warnings["low_stock"].append(stock_warning)
 
     # Build Graph Data
     graph_res = _build_graph_dataset(
-        history, str(product.name), store_name, int(item.id or 0)
+        history, product_name, store_name, int(item.id or 0)
     )
     if graph_res:
         dataset, timestamps = graph_res
         graph_info["graph_data"]["datasets"].append(dataset)
-        graph_info["all_timestamps"].update(timestamps)
+        graph_info["all_timestamps"].append(timestamps)
 
 
 def _apply_best_deal_logic(sorted_products: list[dict]) -> None:
     """Identify and mark the best deal for each product."""
     for p in sorted_products:
-        p["has_best_deal"] = False
-        p["has_target_hit"] = any(it["is_target_hit"] for it in p["tracked_items"])
-        p["has_deal"] = any(
-            it["is_deal"] or it["is_price_drop"] for it in p["tracked_items"]
-        )
+        has_target_hit = False
+        has_deal = False
+        best_item: dict | None = None
+        valid_count = 0
+
+        for it in p["tracked_items"]:
+            has_target_hit = has_target_hit or it["is_target_hit"]
+            has_deal = has_deal or it["is_deal"] or it["is_price_drop"]
 
-        valid_items = [
-            it
-            for it in p["tracked_items"]
-            if it["unit_price"] is not None and it["is_available"] is not False
-        ]
-        if len(valid_items) > 1:
-            best_item = min(valid_items, key=lambda x: x["unit_price"])
-            for it in p["tracked_items"]:
-                if it["id"] == best_item["id"]:
-                    it["is_best_deal"] = True
-                    p["has_best_deal"] = True
+            unit_price = it["unit_price"]
+            if unit_price is None or it["is_available"] is False:
+                continue
+            valid_count += 1
+            if best_item is None or unit_price < best_item["unit_price"]:
+                best_item = it
+
+        p["has_target_hit"] = has_target_hit
+        p["has_deal"] = has_deal
+        p["has_best_deal"] = best_item is not None and valid_count > 1
+        if p["has_best_deal"] and best_item is not None:
+            best_item["is_best_deal"] = True
+
+
+@lru_cache(maxsize=512)
+def _parse_planned_week(planned_date: str) -> datetime | None:
+    """Parse an ISO week (e.g. '2026-W05') as the Monday of that week."""
+    try:
+        return datetime.strptime(planned_date + "-1", "%G-W%V-%u")
+    except (ValueError, TypeError):
+        return None
 
 
 def _get_untracked_planned_products(
-    product_repo: ProductRepository, tracked_repo: TrackedItemRepository
+    product_repo: ProductRepository, tracked_product_ids: set[int]
 ) -> list[dict]:
     """Identify planned but untracked products within the next 4 weeks."""
     now = datetime.now()
     four_weeks_later = now + timedelta(days=28)
 
-    all_products = product_repo.get_all()
-    untracked_planned_products = []
-    for product in all_products:
-        if not product.planned_date:
+    # Padded ISO week strings sort lexicographically, so SQL applies the bound
+    # to those; other spellings come back unfiltered and are checked here
+    candidates = []
+    for product in product_repo.get_planned_until(four_weeks_later.strftime("%G-W%V")):
+        planned_dt = _parse_planned_week(str(product.planned_date))
+        if planned_dt is None or planned_dt > four_weeks_later:
             continue
+        candidates.append(product)
 
-        try:
-            # Parse as the first day of that week (e.g., '2026-W05-1')
-            planned_dt = datetime.strptime(product.planned_date + "-1", "%G-W%V-%u")
-            if planned_dt > four_weeks_later:
-                continue
-        except (ValueError, TypeError):
-            continue
-
-        active_items = [
-            ti
-            for ti in tracked_repo.get_by_product(int(product.id or 0))
-            if ti.is_active
-        ]
-        if not active_items:
-            untracked_planned_products.append(
-                {
-                    "id": product.id,
-                    "name": product.name,
-                    "planned_date": product.planned_date,
-                }
-            )
+    untracked_planned_products = [
+        {
+            "id": product.id,
+            "name": product.name,
+            "planned_date": product.planned_date,
+        }
+        for product in candidates
+        if int(product.id or 0) not in tracked_product_ids
+    ]
 
     untracked_planned_products.sort(key=lambda p: str(p["planned_date"] or ""))
     return untracked_planned_products
 
 
-@router.get("/")
-async def dashboard(request: Request, db: Annotated[Database, Depends(get_db)]):
-    """Render dashboard page."""
+def _build_dashboard_context(db: Database) -> dict[str, Any]:
+    """Compute the dashboard template context from the database."""
     cutoff = datetime.now() - timedelta(days=7)
 
-    try:
-        product_repo = ProductRepository(db)
-        store_repo = StoreRepository(db)
-        tracked_repo = TrackedItemRepository(db)
-        price_repo = PriceHistoryRepository(db)
-
-        tracked_items = tracked_repo.get_all()
-        products_map: dict[int, dict] = {}
-        low_stock_warnings: list[dict] = []
-        price_increase_warnings: list[dict] = []
-        graph_data: dict[str, list] = {"labels": [], "datasets": []}
-        all_timestamps: set[str] = set()
-
-        repos = {
-            "product": product_repo,
-            "store": store_repo,
-            "price": price_repo,
-        }
-        warnings = {
-            "low_stock": low_stock_warnings,
-            "price_increase": price_increase_warnings,
-        }
-        graph_info = {
-            "graph_data": graph_data,
-            "all_timestamps": all_timestamps,
-            "cutoff": cutoff,
-        }
-
-        for item in tracked_items:
-            _process_dashboard_item(
-                item,
-                repos,
-                products_map,
-                warnings,
-                graph_info,
-            )
-
-        sorted_labels = sorted(all_timestamps)
-        graph_data["labels"] = sorted_labels
-        sorted_products = sorted(products_map.values(), key=lambda p: p["name"])
+    product_repo = ProductRepository(db)
+    store_repo = StoreRepository(db)
+    tracked_repo = TrackedItemRepository(db)
+    price_repo = PriceHistoryRepository(db)
 
-        # Apply best deal logic & flags
-        _apply_best_deal_logic(sorted_products)
+    # Inactive items never reach the dashboard, so filter them in SQL
+    active_items = tracked_repo.get_active()
+    products_map: dict[int, dict] = {}
+    low_stock_warnings: list[dict] = []
+    price_increase_warnings: list[dict] = []
+    graph_data: dict[str, list] = {"labels": [], "datasets": []}
+    all_timestamps: list[list[str]] = []
+
+    # Prefetch everything the loop needs so it only does dict lookups
+    urls = list({item.url for item in active_items})
+    lookups = {
+        "products": product_repo.get_by_ids(
+            list({item.product_id for item in active_items})
+        ),
+        "stores": store_repo.get_by_ids(list({item.store_id for item in active_items})),
+        "latest_prices": price_repo.get_latest_by_urls(urls),
+        "histories": price_repo.get_histories_since(urls, cutoff),
+    }
+    warnings = {
+        "low_stock": low_stock_warnings,
+        "price_increase": price_increase_warnings,
+    }
+    graph_info = {
+        "graph_data": graph_data,
+        "all_timestamps": all_timestamps,
+        "cutoff": cutoff,
+        "screenshot_files": _get_screenshot_files(),
+    }
 
-        # Final Sort for UI
-        sorted_products.sort(
-            key=lambda p: (not p["has_target_hit"], not p["has_deal"], p["name"])
+    for item in active_items:
+        _process_dashboard_item(
+            item,
+            lookups,
+            products_map,
+            warnings,
+            graph_info,
         )
 
-        # Flatten deals for summary section
-        all_deals: list[dict[str, Any]] = []
-        for p in sorted_products:
-            all_deals.extend(
-                {
-                    "product_name": p["name"],
-                    "price": item["price"],
-                    "currency": item["currency"],
-                    "unit_price": item["unit_price"],
-                    "unit": item["unit"],
-                    "target_price": p["target_price"],
-                    "target_unit": p["target_unit"],
-                    "is_target_hit": item["is_target_hit"],
-                }
-                for item in p["tracked_items"]
-                if item["is_target_hit"] or item["is_deal"]
-            )
+    # Each dataset's timestamps are already chronological: merge and dedupe
+    graph_data["labels"] = [ts for ts, _ in groupby(heapq.merge(*all_timestamps))]
+    products = list(products_map.values())
 
-        # Identify planned but untracked products
-        untracked_planned_products = _get_untracked_planned_products(
-            product_repo, tracked_repo
-        )
+    # Apply best deal logic & flags
+    _apply_best_deal_logic(products)
 
-        return templates.TemplateResponse(
-            request,
-            "dashboard.html",
+    # Sort for UI once; name is the last key, so no separate pre-sort is needed
+    sorted_products = sorted(
+        products,
+        key=lambda p: (not p["has_target_hit"], not p["has_deal"], p["name"]),
+    )
+
+    # Flatten deals for summary section
+    all_deals: list[dict[str, Any]] = []
+    for p in sorted_products:
+        all_deals.extend(
             {
-                "products": sorted_products,
-                "deals": all_deals,
-                "low_stock": low_stock_warnings,
-                "price_increases": price_increase_warnings,
-                "untracked_planned": untracked_planned_products,
-                "graph_data": graph_data,
-                "has_any_items": len(tracked_items) > 0,
-            },
+                "product_name": p["name"],
+                "price": item["price"],
+                "currency": item["currency"],
+                "unit_price": item["unit_price"],
+                "unit": item["unit"],
+                "target_price": p["target_price"],
+                "target_unit": p["target_unit"],
+                "is_target_hit": item["is_target_hit"],
+            }
+            for item in p["tracked_items"]
+            if item["is_target_hit"] or item["is_deal"]
         )
+
+    # Identify planned but untracked products from the items already loaded
+    untracked_planned_products = _get_untracked_planned_products(
+        product_repo, {item.product_id for item in active_items}
+    )
+
+    return {
+        "products": sorted_products,
+        "deals": all_deals,
+        "low_stock": low_stock_warnings,
+        "price_increases": price_increase_warnings,
+        "untracked_planned": untracked_planned_products,
+        "graph_data": graph_data,
+        # Paused-only setups still get the dashboard, not the onboarding screen
+        "has_any_items": bool(active_items) or tracked_repo.has_any(),
+    }
+
+
+def _page_cache_key(page: str, db: Database) -> tuple:
+    """Key a rendered page on the data version so any write invalidates it."""
+    return (page, db.db_path, Database.data_version)
+
+
+def refresh_dashboard_cache(db: Database) -> str:
+    """Render the dashboard and store the HTML for the current data version."""
+    html = templates.get_template("dashboard.html").render(_build_dashboard_context(db))
+    _page_cache.set(_page_cache_key("dashboard", db), html)
+    return html
+
+
+@lru_cache(maxsize=len(PAGE_TEMPLATES))
+def _render_static_page(name: str) -> str:
+    """Render a page shell that takes no context; its data loads client-side."""
+    return templates.get_template(name).render()
+
+
+def _static_page(request: Request, name: str):
+    """Serve a cached page shell, re-rendering it while templates auto-reload."""
+    if settings.TEMPLATES_AUTO_RELOAD:
+        return templates.TemplateResponse(request, name, {})
+    return HTMLResponse(_render_static_page(name))
+
+
+@router.get("/")
+def dashboard(db: Annotated[Database, Depends(get_db)]):
+    """Render dashboard page."""
+    try:
+        html = _page_cache.get(_page_cache_key("dashboard", db))
+        if html is None:
+            html = refresh_dashboard_cache(db)
+        return HTMLResponse(html)
     finally:
         db.close()
 
@@ -508,38 +565,37 @@ async def dashboard(request: Request, db: Annotated[Database, Depends(get_db)]):
 @router.get("/admin")
 async def admin_page(request: Request):
     """Render admin hub page."""
-    return templates.TemplateResponse(request, "admin.html", {})
+    return _static_page(request, "admin.html")
 
 
 @router.get("/products")
 async def products_page(request: Request):
     """Render products management page."""
-    return templates.TemplateResponse(request, "products.html", {})
+    return _static_page(request, "products.html")
 
 
 def _find_best_deal_for_product(
-    product_id: int,
-    tracked_repo: TrackedItemRepository,
-    price_repo: PriceHistoryRepository,
+    tracked_items: list[TrackedItem],
+    latest_by_url: dict[str, PriceHistoryRecord],
 ) -> Deal | None:
     """Find the best deal for a product among its tracked items."""
-    tracked_items = tracked_repo.get_by_product(product_id)
     best_deal: Deal | None = None
 
     for item in tracked_items:
-        latest = price_repo.get_latest_by_url(item.url)
-        if not latest or not latest.price:
+        latest = latest_by_url.get(item.url)
+        price = latest.price if latest else None
+        if not latest or not price:
             continue
 
         u_price, u_unit = calculate_volume_price(
-            latest.price,
+            price,
             item.items_per_lot,
             item.quantity_size,
             item.quantity_unit,
         )
 
         current_deal: Deal = {
-            "price": latest.price,
+            "price": price,
             "currency": latest.currency,
             "unit_price": u_price,
             "unit": u_unit,
@@ -580,9 +636,8 @@ def _find_best_deal_for_product(
     return best_deal
 
 
-@router.get("/timeline")
-async def timeline_page(request: Request, db: Annotated[Database, Depends(get_db)]):
-    """Render the vertical wishlist timeline."""
+def _build_timeline_context(db: Database) -> dict[str, Any]:
+    """Group planned products by ISO year and week for the timeline."""
     product_repo = ProductRepository(db)
     price_repo = PriceHistoryRepository(db)
     tracked_item_repo = TrackedItemRepository(db)
@@ -595,18 +650,25 @@ async def timeline_page(request: Request, db: Annotated[Database, Depends(get_db
     # Filter products that have a planned date
     planned_products = [p for p in products if p.planned_date]
 
+    # Batch-load tracked items and their latest prices for all planned products
+    items_by_product = tracked_item_repo.get_by_products(
+        [int(p.id or 0) for p in planned_products]
+    )
+    latest_by_url = price_repo.get_latest_by_urls(
+        [item.url for items in items_by_product.values() for item in items]
+    )
+
     for p in planned_products:
         # planned_date is '2026-W05'
         try:
-            if not p.planned_date:
+            planned_dt = _parse_planned_week(p.planned_date) if p.planned_date else None
+            if planned_dt is None:
                 continue
-            year_str, week_str = p.planned_date.split("-W")
-            year = int(year_str)
-            week = int(week_str)
+            year, week, _ = planned_dt.isocalendar()
 
             # Get latest price for the product (best deal among its tracked items)
             best_deal = _find_best_deal_for_product(
-                int(p.id or 0), tracked_item_repo, price_repo
+                items_by_product.get(int(p.id or 0), []), latest_by_url
             )
 
             product_card = {
@@ -636,12 +698,26 @@ async def timeline_page(request: Request, db: Annotated[Database, Depends(get_db
             )
         sorted_timeline.append(year_data)
 
-    return templates.TemplateResponse(
-        request, "timeline.html", {"timeline": sorted_timeline}
-    )
+    return {"timeline": sorted_timeline}
+
+
+@router.get("/timeline")
+def timeline_page(db: Annotated[Database, Depends(get_db)]):
+    """Render the vertical wishlist timeline."""
+    try:
+        cache_key = _page_cache_key("timeline", db)
+        html = _page_cache.get(cache_key)
+        if html is None:
+            html = templates.get_template("timeline.html").render(
+                _build_timeline_context(db)
+            )
+            _page_cache.set(cache_key, html)
+        return HTMLResponse(html)
+    finally:
+        db.close()
 
 
 @router.get("/tracked-items")
 async def tracked_items_page(request: Request):
     """Render tracked items management page."""
-    return templates.TemplateResponse(request, "tracked-items.html", {})
+    return _static_page(request, "tracked-items.html")
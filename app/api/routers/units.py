@@ -67,11 +67,10 @@ async def patch_unit(
         if not update_data:
             return existing
 
-        current_data = existing.model_dump()
-        for key, value in update_data.items():
-            current_data[key] = value
-
-        repo.update(unit_id, Unit(**current_data))
+        # Validate the merged unit: UnitUpdate accepts an explicit null name
+        repo.update(
+            unit_id, Unit.model_validate({**existing.model_dump(), **update_data})
+        )
         return repo.get_by_id(unit_id)
     finally:
         db.close()
@@ -86,24 +85,14 @@ async def delete_unit(unit_id: int, db: Annotated[Database, Depends(get_db)]):
         if not unit:
             raise HTTPException(status_code=404, detail="Unit not found")
 
-        # Check usage in Products
-        # Check usage in Products
-        # We need a get_by_unit search or similar, or just manual query
-        products = db.execute(
-            "SELECT id FROM products WHERE target_unit = ?", (unit.name,)
-        ).fetchall()
-
-        # Check usage in TrackedItems
-        tracked_items = db.execute(
-            "SELECT id FROM tracked_items WHERE quantity_unit = ?", (unit.name,)
-        ).fetchall()
-
-        if products or tracked_items:
+        # Check usage in Products and TrackedItems
+        product_count, tracked_count = repo.count_usage(unit.name)
+        if product_count or tracked_count:
             raise HTTPException(
                 status_code=400,
                 detail=(
-                    f"Cannot delete unit '{unit.name}'. It is used by {len(products)} "
-                    f"products and {len(tracked_items)} tracked items. "
+                    f"Cannot delete unit '{unit.name}'. It is used by {product_count} "
+                    f"products and {tracked_count} tracked items. "
                     "Update them first."
                 ),
             )
@@ -3,9 +3,9 @@
 import argparse
 import asyncio
 import sys
-
-from app.core.batch_extraction import extract_all_items, get_batch_summary
-from app.storage.database import Database
+from collections import Counter
+from collections.abc import AsyncIterator
+from typing import Any
 
 
 def seed_test_data_command(db_path: str = "data/pricespy.db"):
@@ -16,28 +16,49 @@ def seed_test_data_command(db_path: str = "data/pricespy.db"):
 
 def extract_all_command(db_path: str = "data/pricespy.db", delay: float = 5.0):
     """Extract prices for all active tracked items."""
+    # Imported here so `--help` and other commands skip Playwright and friends
+    from app.core.batch_extraction import iter_extractions  # noqa: PLC0415
+    from app.storage.database import Database  # noqa: PLC0415
+
     db = Database(db_path)
     db.initialize()
 
     try:
-        print(f"Starting batch extraction (delay: {delay}s between items)...")
-        results = asyncio.run(extract_all_items(db, delay_seconds=delay))
-        summary = get_batch_summary(results)
+        print(f"Starting batch extraction (delay: {delay}s between item starts)...")
+        status_counts, errors = asyncio.run(
+            _report_extractions(iter_extractions(db, delay_seconds=delay))
+        )
 
         print("\nBatch extraction complete:")
-        print(f"  - Total items: {summary['total']}")
-        print(f"  - Successful: {summary['success_count']}")
-        print(f"  - Errors: {summary['error_count']}")
+        print(f"  - Total items: {sum(status_counts.values())}")
+        print(f"  - Successful: {status_counts['success']}")
+        print(f"  - Errors: {status_counts['error']}")
 
-        if summary["error_count"] > 0:
+        if errors:
             print("\nErrors:")
-            for r in summary["results"]:
-                if r.get("status") == "error":
-                    print(f"  - Item {r['item_id']}: {r.get('error', 'Unknown error')}")
+            for r in errors:
+                print(f"  - Item {r['item_id']}: {r.get('error', 'Unknown error')}")
     finally:
         db.close()
 
 
+async def _report_extractions(
+    extractions: AsyncIterator[tuple[int, dict[str, Any]]],
+) -> tuple[Counter, list[dict[str, Any]]]:
+    """Print each item's outcome as it finishes; keep only counts and errors."""
+    status_counts: Counter = Counter()
+    errors = []
+    done = 0
+    async for _, r in extractions:
+        done += 1
+        status = r.get("status")
+        status_counts[status] += 1
+        if status == "error":
+            errors.append(r)
+        print(f"  [{done}] Item {r['item_id']}: {status}")
+    return status_counts, errors
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -4,13 +4,20 @@ import asyncio
 import json
 import logging
 import time
-from pathlib import Path
+from collections import Counter
+from collections.abc import AsyncIterator
+from operator import itemgetter
 from typing import Any
 
-from app.core.browser import capture_screenshot
+from app.core.browser import (
+    capture_screenshot,
+    save_screenshot,
+    screenshot_path_for,
+    shared_browser,
+)
 from app.core.config import settings
 from app.core.rate_limiter import RateLimitTracker
-from app.core.vision import extract_with_structured_output
+from app.core.vision import extract_with_structured_output, shared_http_session
 from app.models.schemas import (
     ExtractionContext,
     ExtractionLog,
@@ -34,6 +41,11 @@ class ExtractionError(RuntimeError):
     """Custom exception for extraction failures."""
 
 
+def _elapsed_ms(start_ns: int) -> int:
+    """Milliseconds elapsed since a time.perf_counter_ns() reading."""
+    return (time.perf_counter_ns() - start_ns) // 1_000_000
+
+
 async def _get_extraction_context(
     item_id: int, db: Database
 ) -> tuple[ExtractionContext | None, Any | None, TrackedItem | None]:
@@ -70,7 +82,7 @@ async def _run_extraction_loop(
     tracker: RateLimitTracker | None,
     item: TrackedItem,
     db: Database,
-    start_time: float,
+    start_ns: int,
 ) -> tuple[ExtractionResult | None, str | None]:
     """Run the extraction retry loop."""
     log_repo = ExtractionLogRepository(db)
@@ -91,19 +103,24 @@ async def _run_extraction_loop(
         )
 
         screenshot_bytes = await capture_screenshot(url, target_size=item.target_size)
-        screenshot_path = Path(f"screenshots/{item_id}.png")
-        screenshot_path.parent.mkdir(parents=True, exist_ok=True)
-        screenshot_path.write_bytes(screenshot_bytes)
-        context.screenshot_path = str(screenshot_path)
-
-        if tracker:
-            result, model_used = await extract_with_structured_output(
-                screenshot_bytes, api_key, tracker, context=context
-            )
-        else:
-            result, model_used = await extract_with_structured_output(
-                screenshot_bytes, api_key, context=context
-            )
+        # The disk write overlaps with the (much slower) vision call
+        save_task = asyncio.create_task(save_screenshot(item_id, screenshot_bytes))
+        context.screenshot_path = str(screenshot_path_for(item_id))
+        try:
+            if tracker:
+                result, model_used = await extract_with_structured_output(
+                    screenshot_bytes, api_key, tracker, context=context
+                )
+            else:
+                result, model_used = await extract_with_structured_output(
+                    screenshot_bytes, api_key, context=context
+                )
+        finally:
+            # Collect the write's outcome without letting it mask a vision
+            # error that is already propagating
+            (save_error,) = await asyncio.gather(save_task, return_exceptions=True)
+        if isinstance(save_error, BaseException):
+            raise save_error
 
         if not result:
             break
@@ -124,7 +141,7 @@ async def _run_extraction_loop(
                     status="error",
                     model_used=model_used,
                     error_message=f"Retry {attempt}: {result.blocking_type}",
-                    duration_ms=int((time.time() - start_time) * 1000),
+                    duration_ms=_elapsed_ms(start_ns),
                     blocking_type=result.blocking_type,
                     is_screenshot_faulty=result.is_screenshot_faulty,
                 )
@@ -148,46 +165,48 @@ async def _process_extraction_result(
     log_repo = ExtractionLogRepository(db)
     tracked_repo = TrackedItemRepository(db)
 
-    if not result.is_blocked and result.price > 0:
-        price_repo.insert(
-            PriceHistoryRecord(
-                item_id=item_id,
-                product_name=result.product_name,
-                price=result.price,
-                currency=result.currency,
-                is_available=result.is_available,
-                is_size_matched=result.is_size_matched,
-                confidence=1.0,
-                url=url,
-                store_name=result.store_name,
-                original_price=result.original_price,
-                deal_type=result.deal_type,
-                discount_percentage=result.discount_percentage,
-                discount_fixed_amount=result.discount_fixed_amount,
-                deal_description=result.deal_description,
-                notes=result.notes,
-                available_sizes=json.dumps(result.available_sizes)
-                if result.available_sizes
-                else None,
+    # Price, log and last-checked timestamp land in a single commit
+    with db.transaction():
+        if not result.is_blocked and result.price > 0:
+            price_repo.insert(
+                PriceHistoryRecord(
+                    item_id=item_id,
+                    product_name=result.product_name,
+                    price=result.price,
+                    currency=result.currency,
+                    is_available=result.is_available,
+                    is_size_matched=result.is_size_matched,
+                    confidence=1.0,
+                    url=url,
+                    store_name=result.store_name,
+                    original_price=result.original_price,
+                    deal_type=result.deal_type,
+                    discount_percentage=result.discount_percentage,
+                    discount_fixed_amount=result.discount_fixed_amount,
+                    deal_description=result.deal_description,
+                    notes=result.notes,
+                    available_sizes=json.dumps(result.available_sizes)
+                    if result.available_sizes
+                    else None,
+                )
             )
-        )
 
-    log_repo.insert(
-        ExtractionLog(
-            tracked_item_id=item_id,
-            status="success" if not result.is_blocked else "error",
-            model_used=model_used,
-            price=result.price if result.price > 0 else None,
-            currency=result.currency if result.currency != "N/A" else None,
-            duration_ms=duration_ms,
-            blocking_type=result.blocking_type,
-            is_screenshot_faulty=result.is_screenshot_faulty,
-            error_message=f"Blocked: {result.blocking_type}"
-            if result.is_blocked
-            else None,
+        log_repo.insert(
+            ExtractionLog(
+                tracked_item_id=item_id,
+                status="success" if not result.is_blocked else "error",
+                model_used=model_used,
+                price=result.price if result.price > 0 else None,
+                currency=result.currency if result.currency != "N/A" else None,
+                duration_ms=duration_ms,
+                blocking_type=result.blocking_type,
+                is_screenshot_faulty=result.is_screenshot_faulty,
+                error_message=f"Blocked: {result.blocking_type}"
+                if result.is_blocked
+                else None,
+            )
         )
-    )
-    tracked_repo.set_last_checked(item_id)
+        tracked_repo.set_last_checked(item_id)
 
     return {
         "item_id": item_id,
@@ -210,18 +229,26 @@ async def extract_single_item(
     db: Database,
     tracker: RateLimitTracker | None = None,
     delay_seconds: float = 0,
+    prefetched: tuple[TrackedItem, ExtractionContext] | None = None,
 ) -> dict[str, Any]:
-    """Extract price for a single tracked item via AI vision."""
+    """Extract price for a single tracked item via AI vision.
+
+    Callers that already loaded the item and its context (see
+    ``extract_all_items``) pass them as ``prefetched`` to skip the lookups.
+    """
     if delay_seconds > 0:
         await asyncio.sleep(delay_seconds)
 
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     log_repo = ExtractionLogRepository(db)
 
     # Initial data fetching (outside try to avoid TRY301)
-    context, _product, item = await _get_extraction_context(item_id, db)
+    if prefetched:
+        item, context = prefetched
+    else:
+        context, _product, item = await _get_extraction_context(item_id, db)
     if not context or not item:
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = _elapsed_ms(start_ns)
         log_repo.insert(
             ExtractionLog(
                 tracked_item_id=item_id,
@@ -239,10 +266,10 @@ async def extract_single_item(
 
     try:
         result, model_used = await _run_extraction_loop(
-            api_key, context, tracker, item, db, start_time
+            api_key, context, tracker, item, db, start_ns
         )
     except Exception as e:
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = _elapsed_ms(start_ns)
         log_repo.insert(
             ExtractionLog(
                 tracked_item_id=item_id,
@@ -259,7 +286,7 @@ async def extract_single_item(
         }
 
     if not result:
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = _elapsed_ms(start_ns)
         return {
             "item_id": item_id,
             "status": "error",
@@ -267,55 +294,115 @@ async def extract_single_item(
             "duration_ms": duration_ms,
         }
 
-    duration_ms = int((time.time() - start_time) * 1000)
+    duration_ms = _elapsed_ms(start_ns)
     return await _process_extraction_result(
         item_id, item.url, result, model_used, duration_ms, db
     )
 
 
-async def extract_all_items(
-    db: Database, delay_seconds: float = 5.0
-) -> list[dict[str, Any]]:
+async def iter_extractions(
+    db: Database,
+    delay_seconds: float = 5.0,
+    concurrency: int | None = None,
+) -> AsyncIterator[tuple[int, dict[str, Any]]]:
     """
-    Extract prices for all active tracked items.
+    Extract prices for all active tracked items, yielding results as they finish.
+
+    Items run concurrently (bounded by ``concurrency``), so slow pages and
+    vision calls overlap; ``delay_seconds`` only spaces out their start times.
 
     Args:
         db: Database connection
-        delay_seconds: Delay between extractions (default 5s for rate limiting)
+        delay_seconds: Minimum gap between item starts (default 5s for rate limits)
+        concurrency: Max in-flight items (default MAX_CONCURRENT_EXTRACTIONS)
 
-    Returns:
-        List of extraction results for each item
+    Yields:
+        (position, result) pairs in completion order, where position is the
+        item's index in tracked-item order
     """
     api_key = settings.GEMINI_API_KEY
     if not api_key:
-        return [
+        yield (
+            0,
             {
                 "item_id": None,
                 "status": "error",
                 "error": "GEMINI_API_KEY not configured",
-            }
-        ]
+            },
+        )
+        return
 
     tracked_repo = TrackedItemRepository(db)
     tracker = RateLimitTracker(db)
 
-    items = tracked_repo.get_active()
-    results = []
+    # One joined query loads every item's product and category up front
+    items = tracked_repo.get_active_with_context()
+    semaphore = asyncio.Semaphore(concurrency or settings.MAX_CONCURRENT_EXTRACTIONS)
+    pacing_lock = asyncio.Lock()
+    loop = asyncio.get_running_loop()
+    next_start = loop.time()
+
+    async def extract_paced(
+        position: int, item: TrackedItem, context: ExtractionContext
+    ) -> tuple[int, dict[str, Any]]:
+        """Extract one item once a concurrency slot and a start slot are free."""
+        nonlocal next_start
+        async with semaphore:
+            async with pacing_lock:
+                wait = next_start - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                next_start = loop.time() + delay_seconds
+            try:
+                result = await extract_single_item(
+                    item_id=int(item.id or 0),
+                    api_key=api_key,
+                    db=db,
+                    tracker=tracker,
+                    prefetched=(item, context),
+                )
+            except Exception as e:
+                result = {"item_id": item.id, "status": "error", "error": str(e)}
+            return position, result
+
+    # Every item in the batch shares one Chromium process and one HTTP session
+    async with shared_browser(), shared_http_session():
+        tasks = [
+            asyncio.ensure_future(extract_paced(position, item, ctx))
+            for position, (item, ctx) in enumerate(items)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # A consumer that stops early must not leave captures running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-    for i, item in enumerate(items):
-        # Add delay between items (except for the first one)
-        delay = delay_seconds if i > 0 else 0
 
-        result = await extract_single_item(
-            item_id=int(item.id or 0),
-            api_key=api_key,
-            db=db,
-            tracker=tracker,
-            delay_seconds=delay,
-        )
-        results.append(result)
+async def extract_all_items(
+    db: Database,
+    delay_seconds: float = 5.0,
+    concurrency: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Extract prices for all active tracked items.
+
+    See ``iter_extractions`` for how items are scheduled; use it directly to
+    report progress while the batch runs.
 
-    return results
+    Args:
+        db: Database connection
+        delay_seconds: Minimum gap between item starts (default 5s for rate limits)
+        concurrency: Max in-flight items (default MAX_CONCURRENT_EXTRACTIONS)
+
+    Returns:
+        List of extraction results for each item, in tracked-item order
+    """
+    finished = [pair async for pair in iter_extractions(db, delay_seconds, concurrency)]
+    finished.sort(key=itemgetter(0))
+    return [result for _, result in finished]
 
 
 def get_batch_summary(results: list[dict[str, Any]]) -> dict[str, Any]:
@@ -328,12 +415,11 @@ def get_batch_summary(results: list[dict[str, Any]]) -> dict[str, Any]:
     Returns:
         Summary with total, success_count, error_count
     """
-    success_count = sum(1 for r in results if r.get("status") == "success")
-    error_count = sum(1 for r in results if r.get("status") == "error")
+    status_counts = Counter(r.get("status") for r in results)
 
     return {
         "total": len(results),
-        "success_count": success_count,
-        "error_count": error_count,
+        "success_count": status_counts["success"],
+        "error_count": status_counts["error"],
         "results": results,
     }
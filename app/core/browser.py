@@ -1,13 +1,30 @@
 import asyncio
+import functools
+import json
 import logging
+import platform
 import random
-
-from playwright.async_api import BrowserContext, async_playwright
-
-from app.core.store_configs import STORE_CONFIGS, StoreConfig
+import re
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+from playwright.async_api import Error as PlaywrightError
+
+from app.core.config import settings
+from app.core.store_configs import STORE_CONFIGS, StoreConfig, store_config_for_host
 
 logger = logging.getLogger(__name__)
 
+SCREENSHOTS_DIR = Path("screenshots")
+SCREENSHOT_JPEG_QUALITY = 85
+
 
 # Stealth configuration as per SPECS_EXTRACTION_ENGINE.md
 STEALTH_CONFIG = {
@@ -23,8 +40,10 @@ STEALTH_CONFIG = {
 
 # JavaScript to mask automation detection
 # Advanced JavaScript to mask automation detection (Akamai/EdgeSuite bypass)
+# Written as an IIFE: an init script is evaluated, not called, so a bare
+# function expression would define nothing
 STEALTH_SCRIPTS = """
-(lambda) => {
+(() => {
     // Pass the Webdriver Test
     Object.defineProperty(navigator, 'webdriver', { get: () => false });
 
@@ -48,53 +67,45 @@ STEALTH_SCRIPTS = """
             Promise.resolve({ state: Notification.permission }) :
             originalQuery(parameters)
     );
-};
+})();
 """
 
 
-def _get_random_ua_profile():
-    """Pick a random UA profile."""
-    return random.choice(  # noqa: S311 # nosec B311
-        [
-            {
-                "ua": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                ),
-                "platform": '"Windows"',
-                "sec_ch_ua_platform": "Windows",
-            },
-            {
-                "ua": (
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-                "platform": '"macOS"',
-                "sec_ch_ua_platform": "macOS",
-            },
-            {
-                "ua": (
-                    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                ),
-                "platform": '"Linux"',
-                "sec_ch_ua_platform": "Linux",
-            },
-        ]
-    )
-
-
-async def create_stealth_context(playwright) -> BrowserContext:
-    """Create a browser context with stealth settings."""
-    # Standard 1080p viewport is safer than randomized weird dimensions
-    width = 1920
-
-    # Pick a random UA profile
-    profile = _get_random_ua_profile()
-
-    # args to disable automation flags
-    launch_args = [
+_IS_ARM = platform.machine().lower() in ("arm64", "aarch64", "armv7l")
+
+# Browser identities rotated between contexts
+_UA_PROFILE_SOURCES = (
+    {
+        "ua": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        ),
+        "platform": '"Windows"',
+        "sec_ch_ua_platform": "Windows",
+    },
+    {
+        "ua": (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/120.0.0.0 Safari/537.36"
+        ),
+        "platform": '"macOS"',
+        "sec_ch_ua_platform": "macOS",
+    },
+    {
+        "ua": (
+            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        ),
+        "platform": '"Linux"',
+        "sec_ch_ua_platform": "Linux",
+    },
+)
+
+
+def _launch_args(profile: dict[str, str]) -> tuple[str, ...]:
+    """Chromium command-line flags that disable automation tells."""
+    return (
         "--disable-blink-features=AutomationControlled",
         "--no-sandbox",
         "--disable-setuid-sandbox",
@@ -102,22 +113,28 @@ async def create_stealth_context(playwright) -> BrowserContext:
         "--window-position=0,0",
         "--ignore-certificate-errors",
         "--disable-extensions",
-        "--disable-gpu",  # Often helps on ARM/Raspberry Pi
+        # Often helps on ARM/Raspberry Pi; elsewhere it forces slower
+        # software compositing
+        "--disable-gpu" if _IS_ARM else "--enable-gpu-rasterization",
         f"--user-agent={profile['ua']}",
-    ]
+    )
+
 
-    browser = await playwright.chromium.launch(headless=True, args=launch_args)
+def _context_options(profile: dict[str, str]) -> dict[str, Any]:
+    """Browser context settings (viewport, locale, headers) for a UA profile."""
+    # Standard 1080p viewport is safer than randomized weird dimensions
+    width = 1920
 
     # Use a taller viewport by default to avoid clipping issues
-    return await browser.new_context(
-        viewport={"width": width, "height": 1200},
-        user_agent=profile["ua"],
-        locale=STEALTH_CONFIG["locale"],
-        timezone_id=STEALTH_CONFIG["timezone_id"],
-        geolocation=STEALTH_CONFIG["geolocation"],
-        permissions=STEALTH_CONFIG["permissions"],
+    return {
+        "viewport": {"width": width, "height": 1200},
+        "user_agent": profile["ua"],
+        "locale": STEALTH_CONFIG["locale"],
+        "timezone_id": STEALTH_CONFIG["timezone_id"],
+        "geolocation": STEALTH_CONFIG["geolocation"],
+        "permissions": STEALTH_CONFIG["permissions"],
         # Add extra headers for better stealth
-        extra_http_headers={
+        "extra_http_headers": {
             "Accept": (
                 "text/html,application/xhtml+xml,application/xml;q=0.9,"
                 "image/avif,image/webp,image/apng,*/*;q=0.8,"
@@ -135,201 +152,552 @@ async def create_stealth_context(playwright) -> BrowserContext:
             "Sec-Fetch-User": "?1",
             "Upgrade-Insecure-Requests": "1",
         },
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class _UAProfile:
+    """A UA profile with its launch flags and context settings prebuilt."""
+
+    ua: str
+    launch_args: tuple[str, ...]
+    context_options: dict[str, Any]
+
+
+_UA_PROFILES = tuple(
+    _UAProfile(
+        ua=source["ua"],
+        launch_args=_launch_args(source),
+        context_options=_context_options(source),
     )
+    for source in _UA_PROFILE_SOURCES
+)
 
 
-async def _get_store_config(url: str) -> StoreConfig | None:
-    """Find a store configuration matching the URL."""
-    for keyword, config in STORE_CONFIGS.items():
-        if keyword in url.lower():
-            return config
-    return None
-
-
-async def _smart_accept_dismissal(page) -> bool:
-    """Try to dismiss via common text labels."""
-    smart_labels = [
-        "Akkoord",
-        "Accepteren",
-        "Accept",
-        "Agree",
-        "Toestaan",
-        "Allow",
-        "Conferma",
-        "Accepter",
-        "Accetto",
-    ]
-    for label in smart_labels:
-        try:
-            btn = page.locator(f'button:has-text("{label}")').first
-            if await btn.is_visible(timeout=500):
-                await btn.click()
-                logger.info("Dismissed cookie banner via smart label: %s", label)
-                await page.wait_for_timeout(1000)
-                return True
-        except Exception as e:
-            logger.debug("Smart label '%s' not found or not clickable: %s", label, e)
-            continue
-    return False
-
-
-async def _generic_selector_dismissal(page) -> bool:
-    """Try to dismiss via high-confidence generic selectors."""
-    generic_selectors = [
-        "#sp-cc-accept",
-        "#js-first-screen-accept-all-button",
-        '[data-test="consent-modal-ofc-confirm-btn"]',
-        "#onetrust-accept-btn-handler",
-        "#onetrust-banner-sdk",
-        ".uc-btn-accept",
-    ]
-    for selector in generic_selectors:
-        try:
-            btn = page.locator(selector).first
-            if await btn.is_visible(timeout=500):
-                await btn.click()
-                logger.info(
-                    "Dismissed cookie banner via generic selector: %s", selector
+def _get_random_ua_profile() -> _UAProfile:
+    """Pick a random UA profile."""
+    return random.choice(_UA_PROFILES)  # noqa: S311 # nosec B311
+
+
+async def _launch_browser(playwright, profile: _UAProfile) -> Browser:
+    """Launch headless Chromium with automation flags disabled."""
+    return await playwright.chromium.launch(
+        headless=True, args=list(profile.launch_args)
+    )
+
+
+async def _prepare_context(context: BrowserContext) -> None:
+    """Install the per-context stealth script and media/tracker blocking.
+
+    Context-level init scripts run in every page the context opens, so pages
+    need no setup of their own. Only media and (with BLOCK_TRACKERS) analytics
+    URLs are routed: intercepting every request would add a driver round-trip
+    per request and bypass the HTTP cache. Images and fonts are kept because
+    the vision model reads them.
+    """
+    await context.add_init_script(STEALTH_SCRIPTS)
+    await context.add_init_script(_consent_autoclick_script())
+    await context.route(MEDIA_URL_PATTERN, lambda route: route.abort())
+    if settings.BLOCK_TRACKERS:
+        await context.route(TRACKER_URL_PATTERN, lambda route: route.abort())
+
+
+async def _new_stealth_context(browser: Browser, profile: _UAProfile) -> BrowserContext:
+    """Open a fresh browser context with stealth settings for one capture."""
+    context = await browser.new_context(**profile.context_options)
+    await _prepare_context(context)
+    return context
+
+
+async def create_stealth_context(playwright) -> BrowserContext:
+    """Launch a browser and create a context with stealth settings."""
+    # Pick a random UA profile
+    profile = _get_random_ua_profile()
+    browser = await _launch_browser(playwright, profile)
+    return await _new_stealth_context(browser, profile)
+
+
+class _BrowserSession:
+    """One Chromium process shared by every capture in a session.
+
+    Chromium is launched on the first capture (or by warm_up), so sessions
+    that end up capturing nothing stay cheap. Each capture still gets its own context
+    (fresh cookies and a freshly picked UA profile), unless
+    BROWSER_USER_DATA_DIR is set: then captures open pages in one persistent
+    profile so the HTTP cache and TLS sessions carry over between them.
+    """
+
+    def __init__(self):
+        """Initialize an idle session."""
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._persistent: BrowserContext | None = None
+        self._lock = asyncio.Lock()
+        # Chromium renders screenshots one at a time; cap the pages competing
+        self._capture_slots = asyncio.Semaphore(settings.MAX_CONCURRENT_CAPTURES)
+        self._warmup: asyncio.Task | None = None
+
+    async def _start_playwright(self) -> Playwright:
+        """Start Playwright on first use (call with the lock held)."""
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def new_context(self) -> BrowserContext:
+        """Open a stealth context on the shared browser, launching it if needed."""
+        profile = _get_random_ua_profile()
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                playwright = await self._start_playwright()
+                self._browser = await _launch_browser(playwright, profile)
+        return await _new_stealth_context(self._browser, profile)
+
+    async def persistent_context(self, user_data_dir: str) -> BrowserContext:
+        """Return the persistent-profile context, launching it if needed."""
+        async with self._lock:
+            if self._persistent is None:
+                profile = _get_random_ua_profile()
+                playwright = await self._start_playwright()
+                self._persistent = await playwright.chromium.launch_persistent_context(
+                    user_data_dir,
+                    headless=True,
+                    args=list(profile.launch_args),
+                    **profile.context_options,
                 )
-                await page.wait_for_timeout(1000)
-                return True
-        except Exception as e:
-            logger.debug("Generic selector '%s' not found: %s", selector, e)
-            continue
-    return False
+                await _prepare_context(self._persistent)
+        return self._persistent
+
+    @asynccontextmanager
+    async def capture_context(self) -> AsyncIterator[BrowserContext]:
+        """Hold a capture slot and a browser context for one capture."""
+        async with self._capture_slots:
+            if settings.BROWSER_USER_DATA_DIR:
+                # Shared profile: _capture_page closes its own page afterwards
+                yield await self.persistent_context(settings.BROWSER_USER_DATA_DIR)
+                return
+
+            context = await self.new_context()
+            try:
+                yield context
+            finally:
+                await context.close()
 
+    def start_warm_up(self) -> None:
+        """Launch Chromium in the background so the first capture finds it running."""
+        self._warmup = asyncio.create_task(self._warm_up())
 
-async def _store_specific_dismissal(page, config: StoreConfig) -> bool:
-    """Try to dismiss via store-specific click targets."""
-    if not config.cookie_click_targets:
-        return False
-    for selector in config.cookie_click_targets:
+    async def _warm_up(self) -> None:
+        """Open and close one page, which starts the browser and a renderer."""
         try:
-            btn = page.locator(selector).first
-            if await btn.is_visible(timeout=500):
-                await btn.click()
-                logger.info(
-                    "Dismissed cookie banner via store click target: %s", selector
-                )
-                await page.wait_for_timeout(1000)
-                return True
+            async with self.capture_context() as context:
+                page = await context.new_page()
+                await page.close()
         except Exception as e:
-            logger.debug("Store click target '%s' not found: %s", selector, e)
-            continue
-    return False
+            logger.warning(
+                "Browser warm-up failed, will launch on first capture: %s", e
+            )
+
+    async def close(self) -> None:
+        """Close the shared browser and stop Playwright."""
+        if self._warmup is not None:
+            self._warmup.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._warmup
+        if self._persistent is not None:
+            await self._persistent.close()
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+
+_browser_session: ContextVar[_BrowserSession | None] = ContextVar(
+    "_browser_session", default=None
+)
+
+# Process-wide session, set while the API server is running
+_state: dict[str, _BrowserSession | None] = {"session": None}
+
+
+def _current_session() -> _BrowserSession | None:
+    """Return the session captures should use, if any."""
+    return _browser_session.get() or _state["session"]
+
+
+async def start_browser() -> None:
+    """Keep one browser for every capture until stop_browser() is called.
+
+    Meant for long-running processes (the API server lifespan). With
+    BROWSER_WARMUP on, Chromium is launched in the background right away so
+    the first capture skips the cold start; this never delays startup, and a
+    failed warm-up only means the first capture launches Chromium itself.
+    """
+    if _state["session"] is None:
+        session = _BrowserSession()
+        _state["session"] = session
+        if settings.BROWSER_WARMUP:
+            session.start_warm_up()
+
+
+async def stop_browser() -> None:
+    """Close the process-wide browser started by start_browser()."""
+    session, _state["session"] = _state["session"], None
+    if session is not None:
+        await session.close()
+
+
+@asynccontextmanager
+async def shared_browser() -> AsyncIterator[None]:
+    """Reuse one browser process for every capture_screenshot inside the block.
+
+    If a browser is already shared (server lifespan or an enclosing block),
+    the block uses it instead of starting another.
+
+    Usage:
+        async with shared_browser():
+            await asyncio.gather(*(capture_screenshot(url) for url in urls))
+    """
+    if _current_session() is not None:
+        yield
+        return
+
+    session = _BrowserSession()
+    token = _browser_session.set(session)
+    try:
+        yield
+    finally:
+        _browser_session.reset(token)
+        await session.close()
+
+
+# Video/audio streams: large downloads that a still screenshot never needs
+MEDIA_URL_PATTERN = re.compile(
+    r"\.(mp4|webm|ogv|mov|m3u8|mpd|mp3|m4a|aac|wav)(\?|#|$)", re.IGNORECASE
+)
+
+# Analytics and ad hosts: their beacons keep pages from going network-idle
+TRACKER_URL_PATTERN = re.compile(
+    r"^https?://([^/?#]+\.)?(googletagmanager\.com|google-analytics\.com"
+    r"|doubleclick\.net|segment\.(io|com)|hotjar\.com|connect\.facebook\.net"
+    r"|bat\.bing\.com)(:\d+)?[/?#]",
+    re.IGNORECASE,
+)
+
+# Resolves once running CSS/Web animations finish, or after `ms` for endless ones
+WAIT_FOR_ANIMATIONS_JS = """
+(ms) => Promise.race([
+    Promise.allSettled(document.getAnimations().map((a) => a.finished)),
+    new Promise((resolve) => setTimeout(resolve, ms)),
+])
+"""
+
+
+# Earliest monotonic time the next visit to each host may start
+_domain_next_start: dict[str, float] = {}
+
+
+async def _pace_domain(url: str) -> None:
+    """Keep a randomised 1-4s gap between visits to the same store.
+
+    Only repeat hits on one host are spaced out (that is what bot detection
+    sees); the first visit, and visits to other stores, start immediately.
+    """
+    host = urlsplit(url).hostname or ""
+    now = time.monotonic()
+    start = max(now, _domain_next_start.get(host, now))
+    # Reserve the slot before sleeping so concurrent captures queue up
+    _domain_next_start[host] = start + random.uniform(1, 4)  # noqa: S311 # nosec B311
+    if start > now:
+        await asyncio.sleep(start - now)
+
+
+async def _wait_for_page_to_settle(page, timeout_ms: int = 3000) -> None:
+    """Wait until late requests and animations are done, for at most timeout_ms.
+
+    Returns as soon as the page is quiet instead of always sleeping; scrolling
+    usually triggers lazy-loaded images, hence the network-idle wait.
+    """
+    with suppress(Exception):
+        await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+    with suppress(Exception):
+        await page.evaluate(WAIT_FOR_ANIMATIONS_JS, timeout_ms // 3)
+
+
+def _get_store_config(url: str) -> StoreConfig | None:
+    """Find a store configuration matching the URL's host."""
+    # Matching the host alone keeps a keyword in a path or query from
+    # selecting the wrong store
+    return store_config_for_host(urlsplit(url).hostname or "")
+
+
+# Consent buttons: generic selectors are tried first, then text labels
+COOKIE_ACCEPT_LABELS = (
+    "Akkoord",
+    "Accepteren",
+    "Accept",
+    "Agree",
+    "Toestaan",
+    "Allow",
+    "Conferma",
+    "Accepter",
+    "Accetto",
+)
+COOKIE_ACCEPT_SELECTORS = (
+    "#sp-cc-accept",
+    "#js-first-screen-accept-all-button",
+    '[data-test="consent-modal-ofc-confirm-btn"]',
+    "#onetrust-accept-btn-handler",
+    "#onetrust-banner-sdk",
+    ".uc-btn-accept",
+)
+
+# Clicks the first visible consent button: {selectors} are tried in order,
+# then buttons whose text contains one of {labels}. Returns what it clicked.
+# Playwright-only selectors such as :has-text() are skipped.
+CLICK_CONSENT_JS = """
+(consent) => {
+    const shown = (el) => el !== null && el.getClientRects().length > 0;
+    for (const selector of consent.selectors) {
+        let el = null;
+        try {
+            el = document.querySelector(selector);
+        } catch (e) {
+            continue;
+        }
+        if (shown(el)) {
+            el.click();
+            return selector;
+        }
+    }
+    const buttons = Array.from(document.querySelectorAll('button'));
+    for (const label of consent.labels) {
+        const needle = label.toLowerCase();
+        const match = buttons.find(
+            (b) => shown(b) && b.textContent.toLowerCase().includes(needle)
+        );
+        if (match) {
+            match.click();
+            return label;
+        }
+    }
+    return null;
+}
+"""
+
+# Init script that clicks consent banners from inside the page as soon as they
+# are rendered, so no driver round-trips are spent probing for them. DOM
+# mutations are coalesced to one check per 250ms, and the observer stops after
+# a click or after 30s.
+CONSENT_AUTOCLICK_JS = """
+(() => {
+    const consent = %s;
+    const clickConsent = %s;
+    let pending = false;
+    const observer = new MutationObserver(() => {
+        if (pending) return;
+        pending = true;
+        setTimeout(() => {
+            pending = false;
+            if (clickConsent(consent)) observer.disconnect();
+        }, 250);
+    });
+    observer.observe(document, { childList: true, subtree: true });
+    setTimeout(() => observer.disconnect(), 30000);
+})();
+"""
+
+# Overlays hidden with CSS when no consent button could be clicked
+COOKIE_HIDE_SELECTORS = (
+    ".cookie-banner",
+    ".cookie-notice",
+    "#cookie-law-info-bar",
+    ".consent-banner",
+    ".privacy-overlay",
+)
+
+# Elements to centre before the screenshot, in priority order
+PRODUCT_SELECTORS = (
+    "h1",
+    "h2",  # Added h2 as fallback
+    'img[data-testid="pdp-main-image"]',
+    'img[alt*="product"]',  # Generic fallback
+    ".product-title",
+    ".pdp-info",
+    "#productTitle",
+    ".pdp__name",
+    ".pdp__price",
+)
+
+# Centres the first visible match of {selectors}, tried in order, and nudges
+# the view up a little (big elements would otherwise fill it). Returns the
+# selector used.
+SCROLL_TO_PRODUCT_JS = """
+(selectors) => {
+    for (const selector of selectors) {
+        const el = document.querySelector(selector);
+        if (el !== null && el.getClientRects().length > 0) {
+            el.scrollIntoViewIfNeeded(true);
+            window.scrollBy(0, -100);
+            return selector;
+        }
+    }
+    return null;
+}
+"""
+
+
+@functools.lru_cache(maxsize=32)
+def _overlay_hide_css(store_selectors: tuple[str, ...]) -> str:
+    """Stylesheet hiding the generic overlays plus a store's own selectors."""
+    # One stylesheet, one round-trip: the browser drops an invalid rule on its
+    # own without discarding the others
+    return "\n".join(
+        f"{selector} {{ display: none !important; "
+        "visibility: hidden !important; pointer-events: none !important; }"
+        for selector in (*COOKIE_HIDE_SELECTORS, *store_selectors)
+    )
 
 
 async def _css_hide_dismissal(page, config: StoreConfig | None):
     """Hide persistent overlays via CSS."""
-    hide_selectors = [
-        ".cookie-banner",
-        ".cookie-notice",
-        "#cookie-law-info-bar",
-        ".consent-banner",
-        ".privacy-overlay",
-    ]
-    if config and config.cookie_hide_selectors:
-        hide_selectors.extend(config.cookie_hide_selectors)
-
-    for selector in hide_selectors:
-        try:
-            await page.add_style_tag(
-                content=(
-                    f"{selector} {{ display: none !important; "
-                    "visibility: hidden !important; pointer-events: none !important; }"
-                )
-            )
-        except Exception as e:
-            logger.debug("Hiding selector '%s' failed: %s", selector, e)
-            continue
+    store_selectors = tuple(config.cookie_hide_selectors) if config else ()
+    try:
+        await page.add_style_tag(content=_overlay_hide_css(store_selectors))
+    except Exception as e:
+        logger.debug("Hiding overlays via CSS failed: %s", e)
 
 
-async def _dismiss_cookie_consent(page, config: StoreConfig | None = None):
-    """Try to dismiss cookie consent popups using smart heuristics and store config."""
-    try:
-        # 1. Smart Accept Heuristic (Text-based)
-        if await _smart_accept_dismissal(page):
-            return
+def _consent_targets(configs: list[StoreConfig]) -> dict[str, list[str]]:
+    """Arguments for CLICK_CONSENT_JS covering the given store configs."""
+    selectors = list(COOKIE_ACCEPT_SELECTORS)
+    for config in configs:
+        selectors.extend(config.cookie_click_targets)
+    return {"labels": list(COOKIE_ACCEPT_LABELS), "selectors": selectors}
 
-        # 2. Generic Selectors (High confidence fallbacks)
-        if await _generic_selector_dismissal(page):
-            return
 
-        # 3. Store-Specific Click Targets
-        if config and await _store_specific_dismissal(page, config):
-            return
+@functools.cache
+def _consent_autoclick_script() -> str:
+    """Build the consent init script.
 
-        # 4. CSS Hiding Fallback (Last resort for persistent overlays)
-        await _css_hide_dismissal(page, config)
+    A context may visit any store, so it carries every store's click targets.
+    """
+    targets = _consent_targets(list(STORE_CONFIGS.values()))
+    return CONSENT_AUTOCLICK_JS % (json.dumps(targets), CLICK_CONSENT_JS.strip())
 
+
+async def _dismiss_cookie_consent(page, config: StoreConfig | None = None):
+    """Click any consent banner the init script missed, else hide overlays.
+
+    The autoclick init script normally dismisses the banner while the page
+    loads; this is the single in-page verification pass afterwards.
+    """
+    targets = _consent_targets([config] if config else [])
+    try:
+        clicked = await page.evaluate(CLICK_CONSENT_JS, targets)
     except Exception as e:
         logger.debug("Cookie consent handling failed: %s", e)
+        clicked = None
+    if clicked:
+        logger.info("Dismissed remaining cookie banner via %s", clicked)
+        return
+
+    # CSS Hiding Fallback (Last resort for persistent overlays)
+    await _css_hide_dismissal(page, config)
 
 
 async def _scroll_to_product(page):
     """Try to find a product image or main title to scroll to and center it."""
-    product_selectors = [
-        "h1",
-        "h2",  # Added h2 as fallback
-        'img[data-testid="pdp-main-image"]',
-        'img[alt*="product"]',  # Generic fallback
-        ".product-title",
-        ".pdp-info",
-        "#productTitle",
-        ".pdp__name",
-        ".pdp__price",
-    ]
+    # One round-trip for the whole priority list instead of one per selector
     try:
-        for selector in product_selectors:
-            el = page.locator(selector).first
-            if await el.is_visible(timeout=2000):
-                # Try to center the element in the viewport
-                await el.scroll_into_view_if_needed()
-                # Subtle adjustment to pull it slightly up if it's a big element
-                await page.mouse.wheel(0, -100)
-                break
-    except Exception as e:
+        await page.evaluate(SCROLL_TO_PRODUCT_JS, list(PRODUCT_SELECTORS))
+    except PlaywrightError as e:
         logger.debug("Scrolling to product failed: %s", e)
 
 
+@functools.cache
+def _screenshots_dir() -> Path:
+    """Create the screenshots directory once per process."""
+    SCREENSHOTS_DIR.mkdir(parents=True, exist_ok=True)
+    return SCREENSHOTS_DIR
+
+
+def screenshot_path_for(item_id: int) -> Path:
+    """Return where an item's latest screenshot is stored."""
+    return SCREENSHOTS_DIR / f"{item_id}.jpg"
+
+
+async def save_screenshot(item_id: int, screenshot_bytes: bytes) -> Path:
+    """Write an item's screenshot off the event loop and return its path."""
+    _screenshots_dir()
+    screenshot_path = screenshot_path_for(item_id)
+    await asyncio.to_thread(screenshot_path.write_bytes, screenshot_bytes)
+    return screenshot_path
+
+
 async def capture_screenshot(url: str, target_size: str | None = None) -> bytes:
-    """Navigate to URL and capture screenshot as PNG bytes."""
+    """Navigate to URL and capture screenshot as JPEG bytes."""
+    # Pace before taking a capture slot, so a queue of visits to one store
+    # never holds slots (and open contexts) that other stores could use
+    await _pace_domain(url)
+
+    session = _current_session()
+    if session is not None:
+        async with session.capture_context() as context:
+            return await _capture_page(context, url, target_size)
+
     async with async_playwright() as p:
         context = await create_stealth_context(p)
-        page = await context.new_page()
+        try:
+            return await _capture_page(context, url, target_size)
+        finally:
+            if context.browser:
+                await context.browser.close()
 
-        await page.add_init_script(STEALTH_SCRIPTS)
-        await asyncio.sleep(random.uniform(1, 4))  # noqa: S311 # nosec B311
 
-        try:
-            await page.goto(url, wait_until="networkidle", timeout=60000)
-        except Exception as e:
-            logger.warning("Networkidle failed for %s, falling back: %s", url, e)
-            try:
-                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            except Exception:
-                logger.exception("Failed to navigate to %s", url)
-                raise
+async def _capture_page(
+    context: BrowserContext, url: str, target_size: str | None
+) -> bytes:
+    """Load URL in a new page of context and screenshot it."""
+    page = await context.new_page()
+    try:
+        return await _screenshot_page(page, url, target_size)
+    finally:
+        await page.close()
+
+
+async def _screenshot_page(page, url: str, target_size: str | None) -> bytes:
+    """Navigate page to URL, tidy it up for a product shot and screenshot it."""
+    try:
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+    except Exception:
+        logger.exception("Failed to navigate to %s", url)
+        raise
 
-        # Get store-specific config
-        config = await _get_store_config(url)
+    # Analytics-heavy pages may never go network-idle; cap each wait instead
+    # of re-navigating when one of them times out
+    try:
+        await page.wait_for_load_state("load", timeout=20000)
+    except Exception as e:
+        logger.warning("Load event not reached for %s, continuing: %s", url, e)
+    with suppress(Exception):
+        await page.wait_for_load_state("networkidle", timeout=3000)
 
-        # Try to dismiss cookie consent popups
-        await _dismiss_cookie_consent(page, config)
+    # Get store-specific config
+    config = _get_store_config(url)
 
-        # Handle custom interactions (e.g., size selection)
-        if config and config.custom_interaction:
-            await config.custom_interaction(page, target_size)
+    # Try to dismiss cookie consent popups
+    await _dismiss_cookie_consent(page, config)
 
-        # Try to find a product image or main title to scroll to
-        await _scroll_to_product(page)
+    # Handle custom interactions (e.g., size selection)
+    if config and config.custom_interaction:
+        await config.custom_interaction(page, target_size)
 
-        # Wait for page to stabilize
-        await page.wait_for_timeout(3000)
+    # Try to find a product image or main title to scroll to
+    await _scroll_to_product(page)
 
-        # Capture screenshot (removed hardcoded clip to use full viewport)
-        screenshot_bytes = await page.screenshot(type="png")
+    # Wait for page to stabilize
+    await _wait_for_page_to_settle(page)
 
-        if context.browser:
-            await context.browser.close()
-        return screenshot_bytes
+    # Capture screenshot (removed hardcoded clip to use full viewport).
+    # JPEG keeps price text legible at a fraction of PNG's size and encode time
+    return await page.screenshot(type="jpeg", quality=SCREENSHOT_JPEG_QUALITY)
@@ -33,6 +33,13 @@ class Settings(BaseSettings):
 
     # Browser
     HEADLESS: bool = True
+    MAX_CONCURRENT_CAPTURES: int = 3
+    BROWSER_USER_DATA_DIR: str | None = None
+    BROWSER_WARMUP: bool = True
+    BLOCK_TRACKERS: bool = True
+
+    # UI
+    TEMPLATES_AUTO_RELOAD: bool = False
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
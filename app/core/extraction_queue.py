@@ -1,10 +1,13 @@
 """Extraction queue with concurrency management."""
 
 import asyncio
+from collections import Counter
 from typing import Any, cast
 
 from app.core.batch_extraction import extract_single_item
+from app.core.browser import shared_browser
 from app.core.config import settings
+from app.core.vision import shared_http_session
 from app.models.schemas import (
     ExtractionContext,
     TrackedItem,
@@ -107,7 +110,8 @@ async def process_extraction_queue(
 
     # Process all items with concurrency limit
     tasks = [extract_with_limit(item) for item in items]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    async with shared_browser(), shared_http_session():
+        results = await asyncio.gather(*tasks, return_exceptions=True)
 
     # Convert any exceptions to error results
     final_results = []
@@ -132,12 +136,11 @@ def get_queue_summary(results: list[dict[str, Any]]) -> dict[str, Any]:
     Returns:
         Summary with total, success_count, error_count
     """
-    success_count = sum(1 for r in results if r.get("status") == "success")
-    error_count = sum(1 for r in results if r.get("status") == "error")
+    status_counts = Counter(r.get("status") for r in results)
 
     return {
         "total": len(results),
-        "success_count": success_count,
-        "error_count": error_count,
+        "success_count": status_counts["success"],
+        "error_count": status_counts["error"],
         "results": results,
     }
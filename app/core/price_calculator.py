@@ -1,6 +1,7 @@
 """Price calculation and comparison logic."""
 
 import json
+from functools import lru_cache
 from typing import Any
 
 from app.models.schemas import PriceComparison
@@ -15,6 +16,7 @@ UNIT_CONVERSIONS = {
 }
 
 
+@lru_cache(maxsize=128)
 def normalize_unit(unit: str) -> str:
     """Normalize unit string to match standard units (e.g., 'KG' -> 'kg')."""
     if not unit:
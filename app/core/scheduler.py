@@ -9,6 +9,7 @@ from typing import Any
 from apscheduler.schedulers.asyncio import AsyncIOScheduler  # type: ignore
 from apscheduler.triggers.cron import CronTrigger  # type: ignore
 
+from app.core.browser import start_browser, stop_browser
 from app.core.config import settings
 from app.core.email_report import send_daily_report
 from app.core.extraction_queue import get_queue_summary, process_extraction_queue
@@ -196,7 +197,9 @@ async def trigger_run_now():
 
 @asynccontextmanager
 async def lifespan_scheduler(_app):
-    """FastAPI lifespan context manager for scheduler."""
+    """FastAPI lifespan context manager for scheduler and shared browser."""
+    await start_browser()
     start_scheduler()
     yield
     stop_scheduler()
+    await stop_browser()
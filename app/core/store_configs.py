@@ -1,7 +1,10 @@
+import functools
 from collections.abc import Callable, Coroutine
 from dataclasses import dataclass, field
 from typing import Any
 
+from playwright.async_api import Error as PlaywrightError
+
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -26,10 +29,40 @@ STORE_CONFIGS: dict[str, StoreConfig] = {}
 def register_store(config: StoreConfig):
     """Register a store configuration."""
     STORE_CONFIGS[config.domain_keyword] = config
+    store_config_for_host.cache_clear()
+
+
+@functools.lru_cache(maxsize=256)
+def store_config_for_host(host: str) -> StoreConfig | None:
+    """Find the store configuration whose keyword appears in a hostname."""
+    for keyword, config in STORE_CONFIGS.items():
+        if keyword in host:
+            return config
+    return None
 
 
 # --- Specialized Interactions ---
 
+ZALANDO_SIZE_PICKER_SELECTORS = (
+    'button[data-testid="pdp-size-picker-trigger"]',
+    'button[data-testid="pdp-size-selector-trigger"]',
+    'button:has-text("Maat kiezen")',
+    'button:has-text("Select size")',
+)
+
+
+async def _wait_for_any_visible(page, selectors, timeout_ms: int):
+    """Race selectors for a visible match and return it, or None on timeout."""
+    locator = page.locator(f"{selectors[0]} >> visible=true")
+    for selector in selectors[1:]:
+        locator = locator.or_(page.locator(f"{selector} >> visible=true"))
+    try:
+        await locator.first.wait_for(state="visible", timeout=timeout_ms)
+    except PlaywrightError as e:
+        logger.debug("No visible match for %s: %s", selectors, e)
+        return None
+    return locator.first
+
 
 async def handle_zalando_interaction(page, target_size: str | None = None):
     """Specialized interaction for Zalando to handle size selection."""
@@ -41,38 +74,33 @@ async def handle_zalando_interaction(page, target_size: str | None = None):
                 btn = page.locator(s).first
                 if await btn.is_visible(timeout=3000):
                     return btn
-            except Exception as e:
+            except PlaywrightError as e:
                 logger.debug("Button selector '%s' failed: %s", s, e)
                 continue
         return None
 
     try:
-        # 1. Trigger size picker
-        btn = await find_button(
-            [
-                'button[data-testid="pdp-size-picker-trigger"]',
-                'button[data-testid="pdp-size-selector-trigger"]',
-                'button:has-text("Maat kiezen")',
-                'button:has-text("Select size")',
-            ]
-        )
+        # 1. Trigger size picker (the selectors are variants of one button,
+        # so whichever renders first will do)
+        btn = await _wait_for_any_visible(page, ZALANDO_SIZE_PICKER_SELECTORS, 3000)
 
         if btn:
             await btn.scroll_into_view_if_needed()
             await btn.click()
-            await page.wait_for_timeout(1000)
 
             if target_size:
-                # 2. Select specific size
-                opt = await find_button(
-                    [
-                        f'button[data-testid*="size"]:has-text("{target_size}")',
-                        f'button:has-text("{target_size}")',
-                    ]
-                )
+                # 2. Select specific size, once the picker has rendered it
+                option_selectors = [
+                    f'button[data-testid*="size"]:has-text("{target_size}")',
+                    f'button:has-text("{target_size}")',
+                ]
+                await _wait_for_any_visible(page, option_selectors, 1000)
+                # ...but prefer the size-picker button over any other match
+                opt = await find_button(option_selectors)
                 if opt:
+                    # The price refresh this triggers is covered by the
+                    # page-settle wait that runs before the screenshot
                     await opt.click()
-                    await page.wait_for_timeout(2000)
     except Exception:
         logger.exception("Zalando interaction failed")
 
@@ -3,6 +3,9 @@
 import base64
 import json
 import re
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 
 import aiohttp
 
@@ -22,6 +25,44 @@ class GeminiAPIError(Exception):
     """Exception raised for Gemini API errors."""
 
 
+_http_session: ContextVar[aiohttp.ClientSession | None] = ContextVar(
+    "_http_session", default=None
+)
+
+
+@asynccontextmanager
+async def shared_http_session() -> AsyncIterator[None]:
+    """Reuse one keep-alive HTTP session for every Gemini call inside the block.
+
+    Calls made in the block share pooled connections, so the TCP and TLS
+    setup to the Gemini endpoint is paid once rather than per item.
+    """
+    async with aiohttp.ClientSession() as session:
+        token = _http_session.set(session)
+        try:
+            yield
+        finally:
+            _http_session.reset(token)
+
+
+def _image_mime_type(image_bytes: bytes) -> str:
+    """Detect the MIME type of a screenshot from its magic bytes."""
+    if image_bytes.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    return "image/png"
+
+
+@asynccontextmanager
+async def _gemini_session() -> AsyncIterator[aiohttp.ClientSession]:
+    """Yield the shared HTTP session if one is active, else a short-lived one."""
+    session = _http_session.get()
+    if session is not None:
+        yield session
+        return
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
 # JSON Schema for Gemini structured outputs
 EXTRACTION_SCHEMA = {
     "type": "object",
@@ -179,7 +220,12 @@ async def extract_product_info(image_bytes: bytes, api_key: str) -> ProductInfo
             {
                 "parts": [
                     {"text": STRUCTURED_PROMPT},
-                    {"inline_data": {"mime_type": "image/png", "data": image_base64}},
+                    {
+                        "inline_data": {
+                            "mime_type": _image_mime_type(image_bytes),
+                            "data": image_base64,
+                        }
+                    },
                 ]
             }
         ]
@@ -187,7 +233,7 @@ async def extract_product_info(image_bytes: bytes, api_key: str) -> ProductInfo
 
     logger.info("Sending image to Gemini API", extra={"image_size": len(image_bytes)})
 
-    async with aiohttp.ClientSession() as session:
+    async with _gemini_session() as session:
         timeout = aiohttp.ClientTimeout(total=60)
         async with session.post(url, json=payload, timeout=timeout) as response:
             if response.status != HTTP_OK:
@@ -352,7 +398,12 @@ async def _call_gemini_api(
             {
                 "parts": [
                     {"text": prompt_text},
-                    {"inline_data": {"mime_type": "image/png", "data": image_base64}},
+                    {
+                        "inline_data": {
+                            "mime_type": _image_mime_type(image_bytes),
+                            "data": image_base64,
+                        }
+                    },
                 ]
             }
         ],
@@ -362,7 +413,7 @@ async def _call_gemini_api(
         },
     }
 
-    async with aiohttp.ClientSession() as session:
+    async with _gemini_session() as session:
         timeout = aiohttp.ClientTimeout(total=60)
         async with session.post(url, json=payload, timeout=timeout) as response:
             if response.status != HTTP_OK:
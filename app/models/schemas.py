@@ -100,6 +100,9 @@ class Product(BaseModel):
     planned_date: str | None = Field(
         default=None, max_length=20, description="Target purchase date (e.g. 2026-W05)"
     )
+    is_size_sensitive: bool = Field(
+        default=False, description="Mirrored from the product's category"
+    )
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
 
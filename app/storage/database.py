@@ -1,6 +1,12 @@
+import itertools
 import os
 import sqlite3
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import ClassVar
 
 from app.core.config import settings
 
@@ -26,9 +32,12 @@ CREATE TABLE IF NOT EXISTS products (
     target_price REAL,
     target_unit TEXT,
     planned_date TEXT,
+    is_size_sensitive INTEGER DEFAULT 0,
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
+CREATE INDEX IF NOT EXISTS idx_products_target_unit ON products(target_unit);
+
 -- Stores Table (Names only)
 CREATE TABLE IF NOT EXISTS stores (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -64,6 +73,8 @@ CREATE TABLE IF NOT EXISTS tracked_item_labels (
 CREATE INDEX IF NOT EXISTS idx_tracked_items_url ON tracked_items(url);
 CREATE INDEX IF NOT EXISTS idx_tracked_items_product ON tracked_items(product_id);
 CREATE INDEX IF NOT EXISTS idx_tracked_items_active ON tracked_items(is_active);
+CREATE INDEX IF NOT EXISTS idx_tracked_items_quantity_unit
+    ON tracked_items(quantity_unit);
 
 -- Price History Table
 CREATE TABLE IF NOT EXISTS price_history (
@@ -87,7 +98,12 @@ CREATE TABLE IF NOT EXISTS price_history (
     FOREIGN KEY (item_id) REFERENCES tracked_items (id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_price_history_url ON price_history(url);
+-- Serves latest-by-url (ORDER BY created_at DESC, id DESC LIMIT 1) and the
+-- history window (url = ? AND created_at >= ?) without a sort step; it also
+-- supersedes the old single-column url index.
+DROP INDEX IF EXISTS idx_price_history_url;
+CREATE INDEX IF NOT EXISTS idx_price_history_url_created
+    ON price_history(url, created_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_price_history_created_at ON price_history(created_at);
 
 -- Error Log Table
@@ -178,10 +194,15 @@ CREATE INDEX IF NOT EXISTS idx_labels_name ON labels(name);
 class Database:
     """SQLite database connection manager."""
 
+    # Bumped on every commit so in-process read caches can detect writes
+    _write_counter: ClassVar[itertools.count] = itertools.count(1)
+    data_version: ClassVar[int] = 0
+
     def __init__(self, db_path: str = "data/pricespy.db"):
         """Initialize database connection."""
         self.db_path = db_path
         self._conn: sqlite3.Connection | None = None
+        self._transaction_depth = 0
 
     def _connect(self) -> sqlite3.Connection:
         """Create database connection with safety check."""
@@ -205,10 +226,13 @@ class Database:
             raise RuntimeError(msg)
 
         if self._conn is None:
-            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self._conn.row_factory = sqlite3.Row
+            self._conn = self._open_connection()
         return self._conn
 
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open the underlying SQLite connection."""
+        return open_connection(self.db_path)
+
     @staticmethod
     def _ensure_schema_evolutions(cursor) -> None:
         """Handle other small schema evolutions."""
@@ -620,6 +644,20 @@ class Database:
         if "planned_date" not in columns:
             cursor.execute("ALTER TABLE products ADD COLUMN planned_date TEXT")
 
+        # Mirror category size sensitivity onto products
+        if "is_size_sensitive" not in columns:
+            cursor.execute(
+                "ALTER TABLE products ADD COLUMN is_size_sensitive INTEGER DEFAULT 0"
+            )
+            cursor.execute(
+                """
+                UPDATE products SET is_size_sensitive = COALESCE(
+                    (SELECT c.is_size_sensitive FROM categories c
+                     WHERE c.name = products.category), 0
+                )
+                """
+            )
+
         # Handle other schema evolutions
         self._ensure_schema_evolutions(cursor)
 
@@ -634,10 +672,32 @@ class Database:
         conn = self._connect()
         return conn.execute(query, params)
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group several repository writes into a single commit.
+
+        Repository methods still call commit(); inside this block those calls
+        are deferred and the whole group commits (or rolls back) once.
+        """
+        self._transaction_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.rollback()
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self.commit()
+
     def commit(self) -> None:
         """Commit current transaction."""
+        if self._transaction_depth:
+            return
         if self._conn:
             self._conn.commit()
+            Database.data_version = next(Database._write_counter)
 
     def rollback(self) -> None:
         """Rollback current transaction."""
@@ -651,6 +711,91 @@ class Database:
             self._conn = None
 
 
+def file_identity(db_path: str) -> tuple[int, int] | None:
+    """Identify the file currently at db_path (None if it does not exist).
+
+    Changes when the file is replaced, e.g. by a restore that renames the old
+    database away and puts a new one at the same path.
+    """
+    try:
+        stat = Path(db_path).stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def open_connection(db_path: str) -> sqlite3.Connection:
+    """Open a SQLite connection configured the way repositories expect."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class ConnectionPool:
+    """Thread-safe pool of reusable SQLite connections to one database file.
+
+    Usage:
+        pool = ConnectionPool("data/pricespy.db")
+
+        db = PooledDatabase(pool)
+        try:
+            ...
+        finally:
+            db.close()  # hands the connection back instead of closing it
+    """
+
+    def __init__(self, db_path: str, max_idle: int = 8):
+        """Initialize an empty pool."""
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle: deque[sqlite3.Connection] = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, opening a new one if none is free."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return open_connection(self.db_path)
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection, discarding any uncommitted work."""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self) -> None:
+        """Close every idle connection; borrowed ones close when released."""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                self._idle.pop().close()
+
+
+class PooledDatabase(Database):
+    """Database whose connection is borrowed from, and returned to, a pool."""
+
+    def __init__(self, pool: ConnectionPool):
+        """Initialize without touching the pool until the first query."""
+        super().__init__(pool.db_path)
+        self._pool = pool
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Borrow a connection from the pool."""
+        return self._pool.acquire()
+
+    def close(self) -> None:
+        """Return the connection to the pool."""
+        if self._conn:
+            self._pool.release(self._conn)
+            self._conn = None
+
+
 def get_database(db_path: str | None = None) -> Database:
     """Get a database instance."""
     path = db_path or settings.DATABASE_PATH
@@ -2,11 +2,12 @@
 
 import logging
 from datetime import datetime
-from typing import Any
+from typing import Any, ClassVar
 
 from app.models.schemas import (
     Category,
     ErrorRecord,
+    ExtractionContext,
     ExtractionLog,
     Label,
     PriceHistoryRecord,
@@ -16,7 +17,8 @@ from app.models.schemas import (
     TrackedItem,
     Unit,
 )
-from app.storage.database import Database
+from app.storage.database import Database, file_identity
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +111,27 @@ class PriceHistoryRepository(BaseRepository):
             return None
         return self._row_to_record(row)
 
+    def get_latest_by_urls(self, urls: list[str]) -> dict[str, PriceHistoryRecord]:
+        """Get the most recent price history record for each URL in one query."""
+        if not urls:
+            return {}
+
+        placeholders = ",".join("?" for _ in urls)
+        cursor = self.db.execute(
+            f"""
+            SELECT * FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY url ORDER BY created_at DESC, id DESC
+                ) AS rn
+                FROM price_history
+                WHERE url IN ({placeholders})
+            )
+            WHERE rn = 1
+            """,  # nosec # noqa: S608
+            tuple(urls),
+        )
+        return {row["url"]: self._row_to_record(row) for row in cursor.fetchall()}
+
     def get_recent_history_by_url(
         self,
         url: str,
@@ -140,6 +163,26 @@ class PriceHistoryRepository(BaseRepository):
         )
         return [self._row_to_record(row) for row in cursor.fetchall()]
 
+    def get_histories_since(
+        self, urls: list[str], since: datetime
+    ) -> dict[str, list[PriceHistoryRecord]]:
+        """Get price history since a date for several URLs, grouped by URL."""
+        grouped: dict[str, list[PriceHistoryRecord]] = {url: [] for url in urls}
+        if not urls:
+            return grouped
+
+        placeholders = ",".join("?" for _ in urls)
+        cursor = self.db.execute(
+            f"SELECT * FROM price_history WHERE url IN ({placeholders}) "  # nosec # noqa: S608
+            "AND created_at >= ? "
+            # Leading with url lets the (url, created_at) index supply the order
+            "ORDER BY url, created_at DESC",
+            (*urls, since.isoformat()),
+        )
+        for row in cursor.fetchall():
+            grouped.setdefault(row["url"], []).append(self._row_to_record(row))
+        return grouped
+
     @staticmethod
     def _row_to_record(row) -> PriceHistoryRecord:
         """Convert a database row to a PriceHistoryRecord."""
@@ -248,8 +291,11 @@ class ProductRepository(BaseRepository):
         cursor = self.db.execute(
             """
             INSERT INTO products
-            (name, category, purchase_type, target_price, target_unit, planned_date)
-            VALUES (?, ?, ?, ?, ?, ?)
+            (name, category, purchase_type, target_price, target_unit, planned_date,
+             is_size_sensitive)
+            VALUES (?, ?, ?, ?, ?, ?, COALESCE(
+                (SELECT is_size_sensitive FROM categories WHERE name = ?), 0
+            ))
             """,
             (
                 product.name,
@@ -258,6 +304,7 @@ class ProductRepository(BaseRepository):
                 product.target_price,
                 product.target_unit,
                 product.planned_date,
+                product.category,
             ),
         )
         self.db.commit()
@@ -271,6 +318,18 @@ class ProductRepository(BaseRepository):
             return None
         return self._row_to_record(row)
 
+    def get_by_ids(self, product_ids: list[int]) -> dict[int, Product]:
+        """Get several products by ID in one query, keyed by ID."""
+        if not product_ids:
+            return {}
+
+        placeholders = ",".join("?" for _ in product_ids)
+        cursor = self.db.execute(
+            f"SELECT * FROM products WHERE id IN ({placeholders})",  # nosec # noqa: S608
+            tuple(product_ids),
+        )
+        return {row["id"]: self._row_to_record(row) for row in cursor.fetchall()}
+
     def get_all(self) -> list[Product]:
         """Get all products."""
         cursor = self.db.execute("SELECT * FROM products ORDER BY name")
@@ -283,6 +342,23 @@ class ProductRepository(BaseRepository):
         )
         return [self._row_to_record(row) for row in cursor.fetchall()]
 
+    def get_planned_until(self, iso_week: str) -> list[Product]:
+        """Get products planned for an ISO week (e.g. '2026-W05') or earlier.
+
+        Only zero-padded 'YYYY-Www' values sort correctly as strings, so any
+        other spelling (e.g. '2026-W5') is returned as well for the caller to
+        check after parsing it.
+        """
+        cursor = self.db.execute(
+            "SELECT * FROM products "
+            "WHERE planned_date IS NOT NULL AND planned_date != '' "
+            "AND (planned_date <= ? "
+            "OR planned_date NOT GLOB '[0-9][0-9][0-9][0-9]-W[0-9][0-9]') "
+            "ORDER BY planned_date",
+            (iso_week,),
+        )
+        return [self._row_to_record(row) for row in cursor.fetchall()]
+
     def get_by_category(self, category: str) -> list[Product]:
         """Get products by category."""
         cursor = self.db.execute(
@@ -348,7 +424,10 @@ class ProductRepository(BaseRepository):
                 purchase_type = ?,
                 target_price = ?,
                 target_unit = ?,
-                planned_date = ?
+                planned_date = ?,
+                is_size_sensitive = COALESCE(
+                    (SELECT is_size_sensitive FROM categories WHERE name = ?), 0
+                )
             WHERE id = ?
             """,
             (
@@ -358,6 +437,7 @@ class ProductRepository(BaseRepository):
                 product.target_price,
                 product.target_unit,
                 product.planned_date,
+                product.category,
                 product_id,
             ),
         )
@@ -379,6 +459,7 @@ class ProductRepository(BaseRepository):
             target_price=row["target_price"],
             target_unit=row["target_unit"],
             planned_date=row["planned_date"],
+            is_size_sensitive=bool(row["is_size_sensitive"]),
             created_at=datetime.fromisoformat(row["created_at"]),
         )
 
@@ -415,6 +496,18 @@ class StoreRepository(BaseRepository):
             return None
         return self._row_to_record(row)
 
+    def get_by_ids(self, store_ids: list[int]) -> dict[int, Store]:
+        """Get several stores by ID in one query, keyed by ID."""
+        if not store_ids:
+            return {}
+
+        placeholders = ",".join("?" for _ in store_ids)
+        cursor = self.db.execute(
+            f"SELECT * FROM stores WHERE id IN ({placeholders})",  # nosec # noqa: S608
+            tuple(store_ids),
+        )
+        return {row["id"]: self._row_to_record(row) for row in cursor.fetchall()}
+
     def get_by_name(self, name: str) -> Store | None:
         """Get a store by name."""
         cursor = self.db.execute("SELECT * FROM stores WHERE name = ?", (name,))
@@ -500,6 +593,40 @@ class TrackedItemRepository(BaseRepository):
         cursor = self.db.execute("SELECT * FROM tracked_items WHERE is_active = 1")
         return [self._row_to_record(row) for row in cursor.fetchall()]
 
+    def get_active_with_context(self) -> list[tuple[TrackedItem, ExtractionContext]]:
+        """Get active tracked items with their extraction context in one query."""
+        cursor = self.db.execute(
+            """
+            SELECT ti.*,
+                   p.name AS product_name,
+                   c.name AS category_name,
+                   c.is_size_sensitive AS category_is_size_sensitive
+            FROM tracked_items ti
+            LEFT JOIN products p ON p.id = ti.product_id
+            LEFT JOIN categories c ON c.name = p.category
+            WHERE ti.is_active = 1
+            """
+        )
+
+        results = []
+        for row in cursor.fetchall():
+            item = self._row_to_record(row)
+            context = ExtractionContext(
+                product_name=row["product_name"] or "Unknown",
+                category=row["category_name"],
+                is_size_sensitive=bool(row["category_is_size_sensitive"]),
+                target_size=item.target_size,
+                quantity_size=item.quantity_size,
+                quantity_unit=item.quantity_unit,
+            )
+            results.append((item, context))
+        return results
+
+    def has_any(self) -> bool:
+        """Check whether any tracked item exists, active or not."""
+        cursor = self.db.execute("SELECT EXISTS(SELECT 1 FROM tracked_items)")
+        return bool(cursor.fetchone()[0])
+
     def get_due_for_check(self) -> list[TrackedItem]:
         """Get active items not checked today (for scheduled extraction)."""
         cursor = self.db.execute(
@@ -562,6 +689,22 @@ class TrackedItemRepository(BaseRepository):
         )
         return [self._row_to_record(row) for row in cursor.fetchall()]
 
+    def get_by_products(self, product_ids: list[int]) -> dict[int, list[TrackedItem]]:
+        """Get tracked items for several products, grouped by product ID."""
+        grouped: dict[int, list[TrackedItem]] = {pid: [] for pid in product_ids}
+        if not product_ids:
+            return grouped
+
+        placeholders = ",".join("?" for _ in product_ids)
+        cursor = self.db.execute(
+            f"SELECT * FROM tracked_items WHERE product_id IN ({placeholders})",  # nosec # noqa: S608
+            tuple(product_ids),
+        )
+        for row in cursor.fetchall():
+            item = self._row_to_record(row)
+            grouped.setdefault(item.product_id, []).append(item)
+        return grouped
+
     def count_by_store(self, store_id: int) -> int:
         """Count tracked items associated with a store."""
         cursor = self.db.execute(
@@ -611,7 +754,46 @@ class TrackedItemRepository(BaseRepository):
             (tracked_item_id,),
         )
 
-        return [Label(id=row["id"], name=row["name"]) for row in cursor.fetchall()]
+        return [
+            Label(
+                id=row["id"],
+                name=row["name"],
+                created_at=datetime.fromisoformat(row["created_at"]),
+            )
+            for row in cursor.fetchall()
+        ]
+
+    def get_all_with_labels(self) -> list[tuple[TrackedItem, list[Label]]]:
+        """Get all tracked items with their labels in a single query."""
+        cursor = self.db.execute(
+            """
+            SELECT ti.*,
+                   l.id AS label_id,
+                   l.name AS label_name,
+                   l.created_at AS label_created_at
+            FROM tracked_items ti
+            LEFT JOIN tracked_item_labels til ON til.tracked_item_id = ti.id
+            LEFT JOIN labels l ON l.id = til.label_id
+            ORDER BY ti.id
+            """
+        )
+
+        # Items with several labels span several rows: bucket them by item ID
+        grouped: dict[int, tuple[TrackedItem, list[Label]]] = {}
+        for row in cursor.fetchall():
+            entry = grouped.get(row["id"])
+            if entry is None:
+                entry = (self._row_to_record(row), [])
+                grouped[row["id"]] = entry
+            if row["label_id"] is not None:
+                entry[1].append(
+                    Label(
+                        id=row["label_id"],
+                        name=row["label_name"],
+                        created_at=datetime.fromisoformat(row["label_created_at"]),
+                    )
+                )
+        return list(grouped.values())
 
     @staticmethod
     def _row_to_record(row) -> TrackedItem:
@@ -860,6 +1042,17 @@ class SchedulerRunRepository(BaseRepository):
 class CategoryRepository(BaseRepository):
     """Repository for category operations."""
 
+    # Categories are near-immutable at runtime, so name lookups are memoized.
+    # Keys carry the database file's identity so a restored file is never
+    # served from the old one's entries; the TTL bounds how long writes from
+    # other processes (CLI, seeders) go unseen. Writes here clear it at once.
+    _name_cache: ClassVar[TTLCache] = TTLCache(ttl_seconds=60, maxsize=256)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all memoized category lookups."""
+        cls._name_cache.clear()
+
     def normalize_name(self, name: str) -> str:
         """
         Normalize category name: case-insensitive check against DB,
@@ -884,7 +1077,9 @@ class CategoryRepository(BaseRepository):
             "INSERT INTO categories (name, is_size_sensitive) VALUES (?, ?)",
             (category.name, 1 if category.is_size_sensitive else 0),
         )
+        self._sync_products(category)
         self.db.commit()
+        self.clear_cache()
         return int(cursor.lastrowid or 0)
 
     def get_all(self) -> list[Category]:
@@ -900,12 +1095,19 @@ class CategoryRepository(BaseRepository):
         return [self._row_to_record(row) for row in cursor.fetchall()]
 
     def get_by_name(self, name: str) -> Category | None:
-        """Get a category by name."""
+        """Get a category by name (cached in-process)."""
+        key = (self.db.db_path, file_identity(self.db.db_path), name)
+        cached = self._name_cache.get(key)
+        if cached is not None:
+            return cached
+
         cursor = self.db.execute("SELECT * FROM categories WHERE name = ?", (name,))
         row = cursor.fetchone()
         if row is None:
             return None
-        return self._row_to_record(row)
+        category = self._row_to_record(row)
+        self._name_cache.set(key, category)
+        return category
 
     def get_by_id(self, category_id: int) -> Category | None:
         """Get a category by ID."""
@@ -923,12 +1125,22 @@ class CategoryRepository(BaseRepository):
             "UPDATE categories SET name = ?, is_size_sensitive = ? WHERE id = ?",
             (category.name, 1 if category.is_size_sensitive else 0, category_id),
         )
+        self._sync_products(category)
         self.db.commit()
+        self.clear_cache()
 
     def delete(self, category_id: int) -> None:
         """Delete a category."""
         self.db.execute("DELETE FROM categories WHERE id = ?", (category_id,))
         self.db.commit()
+        self.clear_cache()
+
+    def _sync_products(self, category: Category) -> None:
+        """Mirror the category's size sensitivity onto its products."""
+        self.db.execute(
+            "UPDATE products SET is_size_sensitive = ? WHERE category = ?",
+            (1 if category.is_size_sensitive else 0, category.name),
+        )
 
     @staticmethod
     def _row_to_record(row) -> Category:
@@ -1050,6 +1262,19 @@ class UnitRepository(BaseRepository):
         self.db.execute("UPDATE units SET name = ? WHERE id = ?", (unit.name, unit_id))
         self.db.commit()
 
+    def count_usage(self, name: str) -> tuple[int, int]:
+        """Count products and tracked items that reference a unit name."""
+        cursor = self.db.execute(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM products WHERE target_unit = ?),
+                (SELECT COUNT(*) FROM tracked_items WHERE quantity_unit = ?)
+            """,
+            (name, name),
+        )
+        products, tracked_items = cursor.fetchone()
+        return products, tracked_items
+
     def delete(self, unit_id: int) -> None:
         """Delete a unit."""
         self.db.execute("DELETE FROM units WHERE id = ?", (unit_id,))
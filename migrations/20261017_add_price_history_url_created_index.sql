@@ -0,0 +1,5 @@
+-- Migration to back latest-price-per-url and history-window lookups with one index
+
+DROP INDEX IF EXISTS idx_price_history_url;
+CREATE INDEX IF NOT EXISTS idx_price_history_url_created
+    ON price_history(url, created_at DESC, id DESC);
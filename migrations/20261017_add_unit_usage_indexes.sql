@@ -0,0 +1,5 @@
+-- Migration to back unit usage counts and renames with indexes
+
+CREATE INDEX IF NOT EXISTS idx_products_target_unit ON products(target_unit);
+CREATE INDEX IF NOT EXISTS idx_tracked_items_quantity_unit
+    ON tracked_items(quantity_unit);
@@ -7,6 +7,9 @@ from fastapi.testclient import TestClient
 
 from app.api import deps
 from app.api.main import app
+from app.api.routers import ui
+from app.core.config import settings
+from app.storage.repositories import CategoryRepository
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -28,6 +31,9 @@ def test_db():
 
     # Restore
     deps.set_test_db_path(None)
+    deps.close_db_pools()
+    CategoryRepository.clear_cache()
+    ui._page_cache.clear()
 
     # Cleanup
     # Cleanup
@@ -36,7 +42,9 @@ def test_db():
 
 
 @pytest.fixture
-def client():
+def client(monkeypatch):
     """Get a FastAPI TestClient."""
+    # The lifespan must not launch Chromium during tests
+    monkeypatch.setattr(settings, "BROWSER_WARMUP", False)
     with TestClient(app) as c:
         yield c
@@ -0,0 +1,121 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.schemas import Label, Product, Store
+from app.storage.database import Database
+from app.storage.repositories import (
+    LabelRepository,
+    ProductRepository,
+    StoreRepository,
+)
+
+HTTP_OK = 200
+HTTP_CREATED = 201
+HTTP_BAD_REQUEST = 400
+HTTP_UNPROCESSABLE = 422
+
+
+@pytest.fixture
+def seeded(test_db):
+    """Insert a product, a store and a label to link tracked items against."""
+    db = Database(test_db)
+    db.initialize()
+    try:
+        yield {
+            "product_id": ProductRepository(db).insert(
+                Product(name="Oat Milk", category="Dairy")
+            ),
+            "shirt_id": ProductRepository(db).insert(
+                Product(name="Shirt", category="Clothing")
+            ),
+            "store_id": StoreRepository(db).insert(Store(name="Shop")),
+            "label_id": LabelRepository(db).insert(Label(name="TestLabel")),
+        }
+    finally:
+        db.close()
+
+
+def _payload(seeded: dict, **overrides) -> dict:
+    payload = {
+        "product_id": seeded["product_id"],
+        "store_id": seeded["store_id"],
+        "url": "https://example.com/oat-milk",
+        "quantity_size": 1.0,
+        "quantity_unit": "L",
+        "label_ids": [seeded["label_id"]],
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_create_item_with_labels(client: TestClient, seeded):
+    response = client.post("/api/tracked-items", json=_payload(seeded))
+    assert response.status_code == HTTP_CREATED
+    data = response.json()
+    assert data["id"] > 0
+    assert data["is_active"] is True
+    assert [label["name"] for label in data["labels"]] == ["TestLabel"]
+
+
+def test_create_item_size_sensitive_requires_target_size(client: TestClient, seeded):
+    response = client.post(
+        "/api/tracked-items", json=_payload(seeded, product_id=seeded["shirt_id"])
+    )
+    assert response.status_code == HTTP_BAD_REQUEST
+    assert "size-sensitive" in response.json()["detail"]
+
+
+def test_patch_item_merges_fields(client: TestClient, seeded):
+    item_id = client.post("/api/tracked-items", json=_payload(seeded)).json()["id"]
+
+    response = client.patch(
+        f"/api/tracked-items/{item_id}", json={"is_active": False, "items_per_lot": 6}
+    )
+    assert response.status_code == HTTP_OK
+    data = response.json()
+    assert data["is_active"] is False
+    assert data["items_per_lot"] == 6  # noqa: PLR2004
+    assert data["url"] == "https://example.com/oat-milk"
+    assert len(data["labels"]) == 1
+
+
+@pytest.mark.parametrize(
+    "patch", [{"quantity_size": 0}, {"items_per_lot": 0}, {"url": ""}, {"url": None}]
+)
+def test_patch_item_rejects_invalid_fields(client: TestClient, seeded, patch):
+    item_id = client.post("/api/tracked-items", json=_payload(seeded)).json()["id"]
+
+    response = client.patch(f"/api/tracked-items/{item_id}", json=patch)
+    assert response.status_code == HTTP_UNPROCESSABLE
+
+    # The stored item is untouched and still readable
+    response = client.get(f"/api/tracked-items/{item_id}")
+    assert response.status_code == HTTP_OK
+    assert response.json()["quantity_size"] == 1.0
+
+
+def test_list_items_includes_labels(client: TestClient, seeded):
+    client.post("/api/tracked-items", json=_payload(seeded))
+
+    response = client.get("/api/tracked-items")
+    assert response.status_code == HTTP_OK
+    items = response.json()
+    assert len(items) == 1
+    assert items[0]["labels"][0]["name"] == "TestLabel"
+
+
+def test_update_item_returns_written_state(client: TestClient, seeded):
+    item_id = client.post("/api/tracked-items", json=_payload(seeded)).json()["id"]
+
+    response = client.put(
+        f"/api/tracked-items/{item_id}",
+        json=_payload(seeded, url="https://example.com/new", label_ids=[]),
+    )
+    assert response.status_code == HTTP_OK
+    data = response.json()
+    assert data["id"] == item_id
+    assert data["url"] == "https://example.com/new"
+    assert data["labels"] == []
+
+    stored = client.get(f"/api/tracked-items/{item_id}").json()
+    assert stored == data
@@ -6,10 +6,12 @@ from fastapi.testclient import TestClient
 
 from app.api.deps import get_db
 from app.api.main import app
+from app.api.routers import ui
 from app.models.schemas import (
     PriceHistoryRecord,
     ProductResponse,
     StoreResponse,
+    TrackedItem,
     TrackedItemResponse,
 )
 
@@ -43,7 +45,7 @@ def test_dashboard_full_rendering(mock_db):
             alerts_enabled=True,
             labels=[],
         )
-        mock_tracked_repo.return_value.get_all.return_value = [item]
+        mock_tracked_repo.return_value.get_active.return_value = [item]
 
         # Mock product
         product = ProductResponse(
@@ -55,12 +57,12 @@ def test_dashboard_full_rendering(mock_db):
             planned_date="2026-W05",
             created_at=datetime.now(UTC),
         )
-        mock_prod_repo.return_value.get_by_id.return_value = product
-        mock_prod_repo.return_value.get_all.return_value = [product]
+        mock_prod_repo.return_value.get_by_ids.return_value = {1: product}
+        mock_prod_repo.return_value.get_planned_until.return_value = [product]
 
         # Mock store
         store = StoreResponse(id=1, name="Test Store")
-        mock_store_repo.return_value.get_by_id.return_value = store
+        mock_store_repo.return_value.get_by_ids.return_value = {1: store}
 
         # Mock price history (a drop)
         now = datetime.now(UTC)
@@ -86,8 +88,12 @@ def test_dashboard_full_rendering(mock_db):
                 created_at=now - timedelta(days=1),
             ),
         ]
-        mock_price_repo.return_value.get_latest_by_url.return_value = history[0]
-        mock_price_repo.return_value.get_history_since.return_value = history
+        mock_price_repo.return_value.get_latest_by_urls.return_value = {
+            item.url: history[0]
+        }
+        mock_price_repo.return_value.get_histories_since.return_value = {
+            item.url: history
+        }
 
         app.dependency_overrides[get_db] = lambda: mock_db
 
@@ -126,7 +132,7 @@ def test_timeline_page_full(mock_db):
             created_at=datetime.now(UTC),
         )
         mock_prod_repo.return_value.get_all.return_value = [product]
-        mock_tracked_repo.return_value.get_by_product.return_value = []
+        mock_tracked_repo.return_value.get_by_products.return_value = {}
 
         app.dependency_overrides[get_db] = lambda: mock_db
         response = client.get("/timeline")
@@ -141,3 +147,137 @@ def test_tracked_items_page():
     response = client.get("/tracked-items")
     assert response.status_code == HTTP_OK
     assert "Tracked Items" in response.text
+
+
+def test_get_screenshot_files(tmp_path, monkeypatch):
+    for name in ("1.png", "1.jpg", "42.png", "7.jpg", "notes.txt", "check_www.png"):
+        (tmp_path / name).write_bytes(b"")
+    monkeypatch.setattr(ui, "SCREENSHOTS_DIR", str(tmp_path))
+    assert ui._get_screenshot_files() == {1: "1.jpg", 7: "7.jpg", 42: "42.png"}
+
+    monkeypatch.setattr(ui, "SCREENSHOTS_DIR", str(tmp_path / "missing"))
+    assert ui._get_screenshot_files() == {}
+
+
+def test_check_stock_warnings_keywords():
+    rec = MagicMock(notes="Only 2 Units Left in stock")
+    warning = ui._check_stock_warnings(rec, "P", "S")
+    assert warning is not None
+    assert warning["notes"] == rec.notes
+
+    assert ui._check_stock_warnings(MagicMock(notes="In stock"), "P", "S") is None
+    assert ui._check_stock_warnings(MagicMock(notes=None), "P", "S") is None
+
+
+def test_apply_best_deal_logic_single_pass():
+    def item(item_id, unit_price, **flags):
+        return {
+            "id": item_id,
+            "unit_price": unit_price,
+            "is_available": flags.get("is_available", True),
+            "is_target_hit": flags.get("is_target_hit", False),
+            "is_deal": flags.get("is_deal", False),
+            "is_price_drop": False,
+            "is_best_deal": False,
+        }
+
+    products = [
+        {
+            "tracked_items": [
+                item(1, 3.0),
+                item(2, 1.0, is_available=False),
+                item(3, 2.0, is_deal=True),
+                item(4, None, is_target_hit=True),
+            ]
+        },
+        {"tracked_items": [item(5, 1.0)]},
+    ]
+    ui._apply_best_deal_logic(products)
+
+    multi, single = products
+    assert multi["has_target_hit"] is True
+    assert multi["has_deal"] is True
+    assert multi["has_best_deal"] is True
+    assert [it["id"] for it in multi["tracked_items"] if it["is_best_deal"]] == [3]
+    assert single["has_best_deal"] is False
+    assert single["tracked_items"][0]["is_best_deal"] is False
+
+
+def test_hsl_for_is_stable():
+    assert ui._hsl_for(3) == "hsl(51, 70%, 50%)"
+    assert ui._hsl_for(3) is ui._hsl_for(3)
+
+
+def test_build_item_dict_without_price_record():
+    item = TrackedItem(
+        id=7,
+        product_id=1,
+        store_id=1,
+        url="http://example.com/p7",
+        quantity_size=1.0,
+        quantity_unit="L",
+    )
+    product = MagicMock(target_unit="L", target_price=None)
+    product.name = "Milk"
+    warnings: list[dict] = []
+
+    result = ui._build_item_dict(item, product, "Shop", None, [], warnings, None)
+
+    assert result["price"] is None
+    assert result["currency"] == "EUR"
+    assert result["unit_price"] is None
+    assert result["is_deal"] is False
+    assert result["is_size_matched"] is True
+    assert result["is_target_hit"] is False
+    assert warnings == []
+
+
+def test_static_pages_rendered_once():
+    ui._render_static_page.cache_clear()
+    first = client.get("/admin")
+    second = client.get("/admin")
+    assert first.text == second.text
+    assert ui._render_static_page.cache_info().hits == 1
+
+
+def test_untracked_planned_uses_loaded_items():
+    week = datetime.now().strftime("%G-W%V")
+    tracked = MagicMock(id=1, planned_date=week)
+    untracked = MagicMock(id=2, planned_date=week)
+    untracked.name = "Untracked"
+    product_repo = MagicMock()
+    product_repo.get_planned_until.return_value = [tracked, untracked]
+
+    result = ui._get_untracked_planned_products(product_repo, {1})
+
+    assert result == [{"id": 2, "name": "Untracked", "planned_date": week}]
+
+
+def test_untracked_planned_checks_unpadded_weeks_in_python():
+    soon = MagicMock(id=1, planned_date="2020-W5")
+    soon.name = "Soon"
+    far = MagicMock(id=2, planned_date="2999-W5")
+    product_repo = MagicMock()
+    product_repo.get_planned_until.return_value = [soon, far]
+
+    result = ui._get_untracked_planned_products(product_repo, set())
+
+    assert result == [{"id": 1, "name": "Soon", "planned_date": "2020-W5"}]
+
+
+def test_build_graph_dataset_formats_minutes():
+    history = [
+        MagicMock(created_at=datetime(2026, 1, 2, 9, 30, 59, tzinfo=UTC), price=2.0),
+        MagicMock(created_at=datetime(2026, 1, 1, 8, 5, 0), price=3.0),
+    ]
+
+    result = ui._build_graph_dataset(history, "Milk", "Shop", 1)
+
+    assert result is not None
+    dataset, timestamps = result
+    assert timestamps == ["2026-01-01 08:05", "2026-01-02 09:30"]
+    assert dataset["data"] == [
+        {"x": "2026-01-01 08:05", "y": 3.0},
+        {"x": "2026-01-02 09:30", "y": 2.0},
+    ]
+    assert dataset["label"] == "Milk (Shop)"
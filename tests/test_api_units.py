@@ -5,7 +5,7 @@ from fastapi.testclient import TestClient
 
 from app.api.deps import get_db
 from app.api.main import app
-from app.models.schemas import UnitResponse
+from app.models.schemas import Unit, UnitResponse
 
 client = TestClient(app)
 
@@ -64,8 +64,8 @@ def test_delete_unit_success(mock_repo, mock_db):
     mock_repo_inst = mock_repo.return_value
     mock_repo_inst.get_by_id.return_value = UnitResponse(id=1, name="ml")
 
-    # Mock DB executions check usage
-    mock_db.execute.return_value.fetchall.return_value = []  # No usage
+    # No products or tracked items use the unit
+    mock_repo_inst.count_usage.return_value = (0, 0)
 
     app.dependency_overrides[get_db] = lambda: mock_db
 
@@ -82,8 +82,8 @@ def test_delete_unit_in_use(mock_repo, mock_db):
     mock_repo_inst = mock_repo.return_value
     mock_repo_inst.get_by_id.return_value = UnitResponse(id=1, name="ml")
 
-    # Mock DB execution finding a product using it
-    mock_db.execute.return_value.fetchall.side_effect = [[(1,)], []]
+    # One product uses the unit
+    mock_repo_inst.count_usage.return_value = (1, 0)
 
     app.dependency_overrides[get_db] = lambda: mock_db
 
@@ -93,3 +93,35 @@ def test_delete_unit_in_use(mock_repo, mock_db):
     assert "used by" in response.json()["detail"]
 
     app.dependency_overrides.clear()
+
+
+def test_patch_unit_merges_fields(mock_repo, mock_db):
+    mock_repo_inst = mock_repo.return_value
+    mock_repo_inst.get_by_id.side_effect = [
+        Unit(id=1, name="ml"),
+        UnitResponse(id=1, name="mL"),
+    ]
+
+    app.dependency_overrides[get_db] = lambda: mock_db
+
+    response = client.patch("/api/units/1", json={"name": " mL "})
+
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.json()["name"] == "mL"
+    mock_repo_inst.update.assert_called_once_with(1, Unit(id=1, name="mL"))
+
+    app.dependency_overrides.clear()
+
+
+def test_patch_unit_rejects_null_name(mock_repo, mock_db):
+    mock_repo_inst = mock_repo.return_value
+    mock_repo_inst.get_by_id.return_value = Unit(id=1, name="ml")
+
+    app.dependency_overrides[get_db] = lambda: mock_db
+
+    response = client.patch("/api/units/1", json={"name": None})
+
+    assert response.status_code == 422  # noqa: PLR2004
+    mock_repo_inst.update.assert_not_called()
+
+    app.dependency_overrides.clear()
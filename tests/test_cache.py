@@ -0,0 +1,27 @@
+from unittest.mock import patch
+
+from app.utils.cache import TTLCache
+
+
+def test_ttl_cache_hit_and_expiry():
+    cache = TTLCache(ttl_seconds=30)
+    with patch("app.utils.cache.time.monotonic", return_value=100.0):
+        cache.set("key", {"value": 1})
+        assert cache.get("key") == {"value": 1}
+        assert cache.get("missing") is None
+
+    with patch("app.utils.cache.time.monotonic", return_value=131.0):
+        assert cache.get("key") is None
+
+
+def test_ttl_cache_evicts_oldest_when_full():
+    cache = TTLCache(ttl_seconds=30, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2  # noqa: PLR2004
+    assert cache.get("c") == 3  # noqa: PLR2004
+
+    cache.clear()
+    assert cache.get("b") is None
@@ -1,6 +1,10 @@
 from pathlib import Path
 
+from fastapi.testclient import TestClient
+
 from app.api import deps
+from app.api.main import app
+from app.core.config import settings
 
 
 def test_get_db_test_path(test_db):
@@ -9,3 +13,49 @@ def test_get_db_test_path(test_db):
     db = deps.get_db()
     assert db.db_path == test_db
     assert Path(test_db).exists()
+
+
+def test_get_db_reuses_pooled_connection():
+    first = deps.get_db()
+    conn = first._connect()
+    first.close()
+
+    second = deps.get_db()
+    assert second._connect() is conn
+    second.close()
+
+
+def test_get_db_rebuilds_pool_when_file_replaced(test_db):
+    db = deps.get_db()
+    db.execute("INSERT INTO stores (name) VALUES ('Old')")
+    db.commit()
+    db.close()
+
+    Path(test_db).rename(test_db + ".bak")
+    try:
+        db = deps.get_db()
+        rows = db.execute("SELECT name FROM stores WHERE name = 'Old'").fetchall()
+        db.close()
+        assert rows == []
+    finally:
+        Path(test_db + ".bak").unlink()
+
+
+def test_pooled_connection_discards_uncommitted_work():
+    db = deps.get_db()
+    db.execute("INSERT INTO stores (name) VALUES ('Uncommitted')")
+    db.close()
+
+    db = deps.get_db()
+    rows = db.execute("SELECT name FROM stores WHERE name = 'Uncommitted'").fetchall()
+    db.close()
+    assert rows == []
+
+
+def test_app_shutdown_closes_db_pools(monkeypatch):
+    monkeypatch.setattr(settings, "BROWSER_WARMUP", False)
+    with TestClient(app) as client:
+        client.get("/api/units")
+        assert deps._pools
+
+    assert not deps._pools
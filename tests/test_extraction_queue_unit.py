@@ -1,7 +1,16 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
+from playwright.async_api import Error as PlaywrightError
 
+from app.core import batch_extraction, browser
 from app.core.batch_extraction import _process_extraction_result
 from app.core.extraction_queue import _get_context
+from app.core.store_configs import (
+    ZALANDO_SIZE_PICKER_SELECTORS,
+    handle_zalando_interaction,
+)
 from app.models.schemas import Category, ExtractionResult, Product, TrackedItem
 from app.storage.database import Database
 from app.storage.repositories import (
@@ -13,6 +22,12 @@ from app.storage.repositories import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_domain_pacing(monkeypatch):
+    """Start every test with no store visits on record, so none is paced."""
+    monkeypatch.setattr(browser, "_domain_next_start", {})
+
+
 @pytest.mark.asyncio
 async def test_get_context(test_db):
     db = Database(test_db)
@@ -116,3 +131,479 @@ async def test_process_extraction_result(test_db):
     updated_item = tracked_repo.get_by_id(item_id)
     assert updated_item is not None
     assert updated_item.last_checked_at is not None
+
+
+@pytest.mark.asyncio
+async def test_extract_all_items_bounded_concurrency(test_db, monkeypatch):
+    db = Database(test_db)
+    db.initialize()
+    tracked_repo = TrackedItemRepository(db)
+    item_ids = [
+        tracked_repo.insert(
+            TrackedItem(
+                product_id=1,
+                store_id=1,
+                url=f"http://example.com/{i}",
+                quantity_size=1.0,
+                quantity_unit="item",
+            )
+        )
+        for i in range(4)
+    ]
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_extract(item_id, **_kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"item_id": item_id, "status": "success"}
+
+    monkeypatch.setattr(batch_extraction.settings, "GEMINI_API_KEY", "key")
+    monkeypatch.setattr(batch_extraction, "extract_single_item", fake_extract)
+
+    results = await batch_extraction.extract_all_items(
+        db, delay_seconds=0, concurrency=2
+    )
+
+    assert [r["item_id"] for r in results] == item_ids
+    assert peak == 2  # noqa: PLR2004
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_save_screenshot_creates_directory_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(browser, "SCREENSHOTS_DIR", tmp_path / "shots")
+    browser._screenshots_dir.cache_clear()
+    try:
+        first = await browser.save_screenshot(1, b"one")
+        second = await browser.save_screenshot(2, b"two")
+        assert browser._screenshots_dir.cache_info().misses == 1
+    finally:
+        browser._screenshots_dir.cache_clear()
+
+    assert first.read_bytes() == b"one"
+    assert second == tmp_path / "shots" / "2.jpg"
+
+
+@pytest.mark.parametrize(
+    ("vision_error", "expected"),
+    [(ValueError("vision down"), ValueError), (None, OSError)],
+)
+@pytest.mark.asyncio
+async def test_screenshot_write_error_never_masks_vision_error(
+    monkeypatch, vision_error, expected
+):
+    monkeypatch.setattr(
+        batch_extraction, "capture_screenshot", AsyncMock(return_value=b"jpg")
+    )
+    monkeypatch.setattr(
+        batch_extraction, "save_screenshot", AsyncMock(side_effect=OSError("disk"))
+    )
+    monkeypatch.setattr(
+        batch_extraction,
+        "extract_with_structured_output",
+        AsyncMock(side_effect=vision_error, return_value=(None, "model")),
+    )
+    item = TrackedItem(
+        id=1,
+        product_id=1,
+        store_id=1,
+        url="https://example.com",
+        quantity_size=1.0,
+        quantity_unit="L",
+    )
+    context = MagicMock()
+
+    # The vision error wins when both fail; a lone write error still surfaces
+    with pytest.raises(expected):
+        await batch_extraction._run_extraction_loop(
+            "key", context, None, item, MagicMock(), 0
+        )
+
+
+def test_batch_summary_counts_statuses():
+    results = [
+        {"item_id": 1, "status": "success"},
+        {"item_id": 2, "status": "error"},
+        {"item_id": 3, "status": "success"},
+        {"item_id": 4},
+    ]
+
+    summary = batch_extraction.get_batch_summary(results)
+
+    assert summary["total"] == 4  # noqa: PLR2004
+    assert summary["success_count"] == 2  # noqa: PLR2004
+    assert summary["error_count"] == 1
+    assert summary["results"] is results
+
+
+@pytest.mark.asyncio
+async def test_shared_browser_launches_chromium_once(monkeypatch):
+    playwright = MagicMock()
+    playwright.stop = AsyncMock()
+    shared = MagicMock()
+    shared.is_connected.return_value = True
+    shared.close = AsyncMock()
+    shared.new_context = AsyncMock(side_effect=lambda **_kwargs: AsyncMock())
+    playwright.chromium.launch = AsyncMock(return_value=shared)
+    starter = MagicMock()
+    starter.start = AsyncMock(return_value=playwright)
+    monkeypatch.setattr(browser, "async_playwright", lambda: starter)
+    monkeypatch.setattr(browser, "_capture_page", AsyncMock(return_value=b"png"))
+
+    async with browser.shared_browser():
+        shots = await asyncio.gather(
+            browser.capture_screenshot("https://a"),
+            browser.capture_screenshot("https://b"),
+        )
+
+    assert shots == [b"png", b"png"]
+    playwright.chromium.launch.assert_awaited_once()
+    assert shared.new_context.await_count == 2  # noqa: PLR2004
+    shared.close.assert_awaited_once()
+    playwright.stop.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_iter_extractions_yields_in_completion_order(test_db, monkeypatch):
+    db = Database(test_db)
+    db.initialize()
+    tracked_repo = TrackedItemRepository(db)
+    slow_id, fast_id = (
+        tracked_repo.insert(
+            TrackedItem(
+                product_id=1,
+                store_id=1,
+                url=f"http://example.com/{name}",
+                quantity_size=1.0,
+                quantity_unit="item",
+            )
+        )
+        for name in ("slow", "fast")
+    )
+
+    async def fake_extract(item_id, **_kwargs):
+        await asyncio.sleep(0.05 if item_id == slow_id else 0)
+        return {"item_id": item_id, "status": "success"}
+
+    monkeypatch.setattr(batch_extraction.settings, "GEMINI_API_KEY", "key")
+    monkeypatch.setattr(batch_extraction, "extract_single_item", fake_extract)
+
+    finished = [
+        (position, result["item_id"])
+        async for position, result in batch_extraction.iter_extractions(
+            db, delay_seconds=0
+        )
+    ]
+
+    assert finished == [(1, fast_id), (0, slow_id)]
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_process_browser_is_reused_by_batches(monkeypatch):
+    monkeypatch.setattr(browser, "_capture_page", AsyncMock(return_value=b"png"))
+    new_context = AsyncMock(return_value=AsyncMock())
+    close = AsyncMock()
+    monkeypatch.setattr(browser._BrowserSession, "new_context", new_context)
+    monkeypatch.setattr(browser._BrowserSession, "close", close)
+
+    await browser.start_browser()
+    try:
+        await browser.capture_screenshot("https://a")
+        async with browser.shared_browser():
+            await browser.capture_screenshot("https://b")
+        close.assert_not_awaited()
+    finally:
+        await browser.stop_browser()
+
+    assert new_context.await_count == 2  # noqa: PLR2004
+    close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_browser_session_caps_concurrent_captures(monkeypatch):
+    monkeypatch.setattr(browser.settings, "MAX_CONCURRENT_CAPTURES", 2)
+    in_flight = 0
+    peak = 0
+
+    async def fake_capture(*_args):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return b"png"
+
+    monkeypatch.setattr(browser, "_capture_page", fake_capture)
+    monkeypatch.setattr(
+        browser._BrowserSession,
+        "new_context",
+        AsyncMock(side_effect=AsyncMock),
+    )
+
+    async with browser.shared_browser():
+        await asyncio.gather(
+            *(browser.capture_screenshot(f"https://{i}") for i in range(5))
+        )
+
+    assert peak == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_page_settle_waits_are_bounded_and_never_raise():
+    page = MagicMock()
+    page.wait_for_load_state = AsyncMock(side_effect=TimeoutError("busy"))
+    page.evaluate = AsyncMock()
+
+    await browser._wait_for_page_to_settle(page, timeout_ms=3000)
+
+    page.wait_for_load_state.assert_awaited_once_with("networkidle", timeout=3000)
+    page.evaluate.assert_awaited_once_with(browser.WAIT_FOR_ANIMATIONS_JS, 1000)
+
+
+@pytest.mark.asyncio
+async def test_persistent_profile_is_shared_between_captures(tmp_path, monkeypatch):
+    monkeypatch.setattr(browser.settings, "BROWSER_USER_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(browser.settings, "BLOCK_TRACKERS", True)
+    monkeypatch.setattr(browser, "_screenshot_page", AsyncMock(return_value=b"png"))
+    pages = []
+
+    async def new_page():
+        pages.append(AsyncMock())
+        return pages[-1]
+
+    profile = MagicMock()
+    profile.new_page = new_page
+    profile.close = AsyncMock()
+    profile.route = AsyncMock()
+    profile.add_init_script = AsyncMock()
+    playwright = MagicMock()
+    playwright.stop = AsyncMock()
+    playwright.chromium.launch_persistent_context = AsyncMock(return_value=profile)
+    starter = MagicMock()
+    starter.start = AsyncMock(return_value=playwright)
+    monkeypatch.setattr(browser, "async_playwright", lambda: starter)
+
+    async with browser.shared_browser():
+        await browser.capture_screenshot("https://a")
+        await browser.capture_screenshot("https://b")
+
+    launch = playwright.chromium.launch_persistent_context
+    launch.assert_awaited_once()
+    assert launch.await_args.args == (str(tmp_path),)
+    assert len(pages) == 2  # noqa: PLR2004
+    for page in pages:
+        page.close.assert_awaited_once()
+    routed = [c.args[0] for c in profile.route.await_args_list]
+    assert routed == [browser.MEDIA_URL_PATTERN, browser.TRACKER_URL_PATTERN]
+    assert [c.args[0] for c in profile.add_init_script.await_args_list] == [
+        browser.STEALTH_SCRIPTS,
+        browser._consent_autoclick_script(),
+    ]
+    profile.close.assert_awaited_once()
+
+
+def test_media_pattern_only_matches_audio_and_video():
+    pattern = browser.MEDIA_URL_PATTERN
+    assert pattern.search("https://cdn.example.com/promo.MP4?v=2")
+    assert pattern.search("https://cdn.example.com/live/index.m3u8")
+    assert not pattern.search("https://cdn.example.com/product.jpg")
+    assert not pattern.search("https://example.com/mp4-player.js")
+
+
+def test_tracker_pattern_matches_hosts_not_paths():
+    pattern = browser.TRACKER_URL_PATTERN
+    assert pattern.search("https://www.googletagmanager.com/gtm.js?id=GTM-1")
+    assert pattern.search("https://stats.g.doubleclick.net/j/collect")
+    assert pattern.search("https://connect.facebook.net/en_US/fbevents.js")
+    assert not pattern.search("https://shop.example/googletagmanager.com/x")
+    assert not pattern.search("https://notdoubleclick.net/")
+
+
+@pytest.mark.asyncio
+async def test_overlay_css_is_injected_in_one_stylesheet():
+    page = MagicMock()
+    page.add_style_tag = AsyncMock()
+    config = MagicMock(cookie_hide_selectors=["#shop-consent"])
+
+    await browser._css_hide_dismissal(page, config)
+
+    page.add_style_tag.assert_awaited_once()
+    css = page.add_style_tag.await_args.kwargs["content"]
+    assert ".cookie-banner {" in css
+    assert "#shop-consent {" in css
+
+
+def test_consent_autoclick_script_covers_every_store():
+    script = browser._consent_autoclick_script()
+
+    assert "#onetrust-accept-btn-handler" in script
+    assert "#didomi-notice-agree-button" in script
+    assert '"Akkoord"' in script
+
+
+@pytest.mark.asyncio
+async def test_cookie_dismissal_is_one_in_page_pass():
+    page = MagicMock()
+    page.evaluate = AsyncMock(return_value="#shop-accept")
+    page.add_style_tag = AsyncMock()
+    config = MagicMock(cookie_click_targets=["#shop-accept"])
+
+    await browser._dismiss_cookie_consent(page, config)
+
+    page.evaluate.assert_awaited_once()
+    script, targets = page.evaluate.await_args.args
+    assert script == browser.CLICK_CONSENT_JS
+    assert targets["selectors"][-1] == "#shop-accept"
+    page.add_style_tag.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cookie_dismissal_hides_overlays_when_nothing_to_click():
+    page = MagicMock()
+    page.evaluate = AsyncMock(return_value=None)
+    page.add_style_tag = AsyncMock()
+
+    await browser._dismiss_cookie_consent(page)
+
+    page.add_style_tag.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_pacing_only_delays_repeat_visits_to_a_store(monkeypatch):
+    monkeypatch.setattr(browser, "_domain_next_start", {})
+    sleep = AsyncMock()
+    monkeypatch.setattr(browser.asyncio, "sleep", sleep)
+
+    await browser._pace_domain("https://shop.example/a")
+    await browser._pace_domain("https://other.example/b")
+    sleep.assert_not_awaited()
+
+    await browser._pace_domain("https://shop.example/c")
+    sleep.assert_awaited_once()
+    assert 0 < sleep.await_args.args[0] <= 4  # noqa: PLR2004
+
+
+def test_ua_profiles_are_prebuilt():
+    profile = browser._get_random_ua_profile()
+
+    assert profile in browser._UA_PROFILES
+    assert profile.context_options["user_agent"] == profile.ua
+    assert f"--user-agent={profile.ua}" in profile.launch_args
+
+
+def test_stealth_script_runs_when_injected():
+    script = browser.STEALTH_SCRIPTS.strip()
+
+    # An init script is evaluated as-is, so it must invoke itself
+    assert script.startswith("(() => {")
+    assert script.endswith("})();")
+
+
+@pytest.mark.asyncio
+async def test_zalando_without_size_picker_clicks_nothing():
+    locator = MagicMock()
+    locator.or_.return_value = locator
+    locator.first.wait_for = AsyncMock(side_effect=PlaywrightError("Timeout"))
+    locator.first.click = AsyncMock()
+    page = MagicMock()
+    page.locator.return_value = locator
+
+    await handle_zalando_interaction(page)
+
+    assert locator.or_.call_count == len(ZALANDO_SIZE_PICKER_SELECTORS) - 1
+    locator.first.wait_for.assert_awaited_once_with(state="visible", timeout=3000)
+    locator.first.click.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_start_browser_warms_up_in_background(monkeypatch):
+    monkeypatch.setattr(browser.settings, "BROWSER_WARMUP", True)
+    monkeypatch.setattr(browser.settings, "BROWSER_USER_DATA_DIR", None)
+    page = AsyncMock()
+    context = MagicMock()
+    context.new_page = AsyncMock(return_value=page)
+    context.close = AsyncMock()
+    monkeypatch.setattr(
+        browser._BrowserSession, "new_context", AsyncMock(return_value=context)
+    )
+
+    await browser.start_browser()
+    session = browser._state["session"]
+    await session._warmup
+    await browser.stop_browser()
+
+    page.close.assert_awaited_once()
+    context.close.assert_awaited_once()
+
+
+def test_store_config_is_matched_on_host():
+    zalando = browser._get_store_config("https://www.ZALANDO.nl/shoe.html")
+    other = browser._get_store_config("https://shop.example/zalando-style")
+
+    assert zalando is not None
+    assert zalando.domain_keyword == "zalando"
+    assert other is None
+
+
+@pytest.mark.asyncio
+async def test_zalando_size_selection_waits_for_options_not_a_timer():
+    button = MagicMock()
+    button.is_visible = AsyncMock(return_value=True)
+    button.scroll_into_view_if_needed = AsyncMock()
+    button.click = AsyncMock()
+    button.wait_for = AsyncMock()
+    locator = MagicMock(first=button)
+    locator.or_.return_value = locator
+    page = MagicMock()
+    page.locator.return_value = locator
+    page.wait_for_timeout = AsyncMock()
+
+    await handle_zalando_interaction(page, target_size="42")
+
+    assert [c.kwargs["timeout"] for c in button.wait_for.await_args_list] == [
+        3000,
+        1000,
+    ]
+    assert button.click.await_count == 2  # noqa: PLR2004
+    page.wait_for_timeout.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_scroll_to_product_is_one_in_page_call():
+    page = MagicMock()
+    page.evaluate = AsyncMock(side_effect=PlaywrightError("navigated away"))
+
+    await browser._scroll_to_product(page)
+
+    page.evaluate.assert_awaited_once_with(
+        browser.SCROLL_TO_PRODUCT_JS, list(browser.PRODUCT_SELECTORS)
+    )
+
+
+@pytest.mark.asyncio
+async def test_pacing_does_not_hold_a_capture_slot(monkeypatch):
+    monkeypatch.setattr(browser.settings, "MAX_CONCURRENT_CAPTURES", 1)
+    monkeypatch.setattr(browser, "_capture_page", AsyncMock(return_value=b"jpg"))
+    monkeypatch.setattr(
+        browser._BrowserSession, "new_context", AsyncMock(side_effect=AsyncMock)
+    )
+    # A previous visit to the store reserved its next start 0.3s from now
+    browser._domain_next_start["paced.example"] = browser.time.monotonic() + 0.3
+
+    async with browser.shared_browser():
+        paced = asyncio.create_task(
+            browser.capture_screenshot("https://paced.example/item")
+        )
+        await asyncio.sleep(0)
+        # The only slot is free while the paced capture waits its turn
+        await asyncio.wait_for(
+            browser.capture_screenshot("https://other.example/item"), timeout=0.1
+        )
+        assert not paced.done()
+        await paced
@@ -1,3 +1,4 @@
+from app.core import vision
 from app.core.gemini import GeminiModel, GeminiModels
 
 
@@ -22,3 +23,23 @@ def test_api_url_build():
     url = GeminiModels.get_api_url(config, "dummy_key")
     assert "dummy_key" in url
     assert config.model.value in url
+
+
+async def test_shared_http_session_is_reused_and_closed():
+    async with vision.shared_http_session():
+        async with vision._gemini_session() as first:
+            pass
+        async with vision._gemini_session() as second:
+            pass
+        assert first is second
+        assert not first.closed
+    assert first.closed
+
+    async with vision._gemini_session() as standalone:
+        assert standalone is not first
+    assert standalone.closed
+
+
+def test_image_mime_type_detection():
+    assert vision._image_mime_type(b"\xff\xd8\xff\xe0rest") == "image/jpeg"
+    assert vision._image_mime_type(b"\x89PNG\r\n\x1a\nrest") == "image/png"
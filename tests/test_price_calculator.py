@@ -78,3 +78,12 @@ def test_compare_prices_no_previous():
     assert comparison.current_price == 10.0  # noqa: PLR2004
     assert comparison.previous_price is None
     assert comparison.price_change is None
+
+
+def test_normalize_unit_is_cached():
+    normalize_unit.cache_clear()
+    normalize_unit("ML")
+    normalize_unit("ML")
+    info = normalize_unit.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
@@ -1,10 +1,24 @@
-from app.models.schemas import Category, Label, Product, TrackedItem
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from app.models.schemas import (
+    Category,
+    Label,
+    PriceHistoryRecord,
+    Product,
+    Store,
+    TrackedItem,
+)
 from app.storage.database import Database
 from app.storage.repositories import (
     CategoryRepository,
     LabelRepository,
+    PriceHistoryRepository,
     ProductRepository,
     PurchaseTypeRepository,
+    StoreRepository,
     TrackedItemRepository,
     UnitRepository,
 )
@@ -119,3 +133,340 @@ def test_tracked_item_repository(test_db):
     updated = repo.get_by_id(item_id)
     assert updated is not None
     assert updated.last_checked_at is not None
+
+
+def test_category_get_by_name_is_cached(test_db):
+    db = Database(test_db)
+    db.initialize()
+    repo = CategoryRepository(db)
+
+    cat_id = repo.insert(Category(name="CachedCategory", is_size_sensitive=False))
+    first = repo.get_by_name("CachedCategory")
+    assert first is not None
+
+    # Served from cache: a raw write bypassing the repository is not seen
+    db.execute("UPDATE categories SET is_size_sensitive = 1 WHERE id = ?", (cat_id,))
+    db.commit()
+    cached = repo.get_by_name("CachedCategory")
+    assert cached is not None
+    assert cached.is_size_sensitive is False
+
+    # Repository writes invalidate the cache
+    repo.update(cat_id, Category(name="CachedCategory", is_size_sensitive=True))
+    refreshed = repo.get_by_name("CachedCategory")
+    assert refreshed is not None
+    assert refreshed.is_size_sensitive is True
+
+    repo.delete(cat_id)
+    assert repo.get_by_name("CachedCategory") is None
+
+
+def test_category_cache_follows_a_replaced_database_file(test_db):
+    db = Database(test_db)
+    db.initialize()
+    CategoryRepository(db).insert(Category(name="Shoes", is_size_sensitive=False))
+    assert CategoryRepository(db).get_by_name("Shoes").is_size_sensitive is False
+    db.close()
+
+    # Restore-style swap: the old file is renamed away and a new one takes
+    # its path, written by another process (no cache invalidation here)
+    Path(test_db).rename(test_db + ".bak")
+    try:
+        restored = Database(test_db)
+        restored.initialize()
+        restored.execute(
+            "INSERT INTO categories (name, is_size_sensitive) VALUES ('Shoes', 1)"
+        )
+        restored.commit()
+
+        category = CategoryRepository(restored).get_by_name("Shoes")
+        restored.close()
+        assert category is not None
+        assert category.is_size_sensitive is True
+    finally:
+        Path(test_db + ".bak").unlink()
+
+
+def test_category_cache_entries_expire(test_db, monkeypatch):
+    monkeypatch.setattr(CategoryRepository._name_cache, "ttl_seconds", 0)
+    db = Database(test_db)
+    db.initialize()
+    repo = CategoryRepository(db)
+    cat_id = repo.insert(Category(name="Expiring", is_size_sensitive=False))
+    assert repo.get_by_name("Expiring").is_size_sensitive is False
+
+    # A write from another process is picked up once the entry expires
+    db.execute("UPDATE categories SET is_size_sensitive = 1 WHERE id = ?", (cat_id,))
+    db.commit()
+    assert repo.get_by_name("Expiring").is_size_sensitive is True
+
+
+def test_product_mirrors_category_size_sensitivity(test_db):
+    db = Database(test_db)
+    db.initialize()
+    prod_repo = ProductRepository(db)
+    cat_repo = CategoryRepository(db)
+
+    # Seeded size-sensitive category
+    prod_id = prod_repo.insert(Product(name="Jeans", category="Clothing"))
+    found = prod_repo.get_by_id(prod_id)
+    assert found is not None
+    assert found.is_size_sensitive is True
+
+    # Moving to a non-sensitive category clears the flag
+    found.category = "Dairy"
+    prod_repo.update(prod_id, found)
+    moved = prod_repo.get_by_id(prod_id)
+    assert moved is not None
+    assert moved.is_size_sensitive is False
+
+    # Category changes propagate to its products
+    dairy = cat_repo.get_by_name("Dairy")
+    assert dairy is not None
+    cat_repo.update(int(dairy.id or 0), Category(name="Dairy", is_size_sensitive=True))
+    synced = prod_repo.get_by_id(prod_id)
+    assert synced is not None
+    assert synced.is_size_sensitive is True
+
+
+def test_batched_timeline_lookups(test_db):
+    db = Database(test_db)
+    db.initialize()
+    tracked_repo = TrackedItemRepository(db)
+    price_repo = PriceHistoryRepository(db)
+
+    for pid, url in [(1, "https://a.example"), (1, "https://b.example")]:
+        tracked_repo.insert(
+            TrackedItem(product_id=pid, store_id=1, url=url, quantity_unit="ml")
+        )
+
+    grouped = tracked_repo.get_by_products([1, 2])
+    assert len(grouped[1]) == 2  # noqa: PLR2004
+    assert grouped[2] == []
+
+    for price in (5.0, 4.0):
+        price_repo.insert(
+            PriceHistoryRecord(
+                product_name="P", price=price, confidence=1.0, url="https://a.example"
+            )
+        )
+
+    latest = price_repo.get_latest_by_urls(["https://a.example", "https://b.example"])
+    assert set(latest) == {"https://a.example"}
+    assert latest["https://a.example"].price == 4.0  # noqa: PLR2004
+    assert price_repo.get_latest_by_urls([]) == {}
+
+
+def test_product_get_planned_until(test_db):
+    db = Database(test_db)
+    db.initialize()
+    repo = ProductRepository(db)
+
+    repo.insert(Product(name="Soon", planned_date="2026-W05"))
+    repo.insert(Product(name="Later", planned_date="2026-W12"))
+    repo.insert(Product(name="Unplanned"))
+
+    names = [p.name for p in repo.get_planned_until("2026-W10")]
+    assert names == ["Soon"]
+
+
+def test_product_get_planned_until_keeps_unpadded_weeks(test_db):
+    db = Database(test_db)
+    db.initialize()
+    repo = ProductRepository(db)
+
+    # "2026-W5" > "2026-W45" as strings, but week 5 is long before week 45
+    repo.insert(Product(name="Unpadded", planned_date="2026-W5"))
+    repo.insert(Product(name="Padded later", planned_date="2026-W50"))
+
+    names = [p.name for p in repo.get_planned_until("2026-W45")]
+    assert names == ["Unpadded"]
+
+
+def test_price_history_lookups_use_url_created_index(test_db):
+    db = Database(test_db)
+    db.initialize()
+
+    queries = [
+        (
+            "SELECT * FROM price_history WHERE url = ? "
+            "ORDER BY created_at DESC, id DESC LIMIT 1",
+            ("u",),
+        ),
+        (
+            "SELECT * FROM price_history WHERE url = ? AND created_at >= ? "
+            "ORDER BY created_at DESC",
+            ("u", "2026-01-01"),
+        ),
+        (
+            "SELECT * FROM price_history WHERE url IN (?, ?) AND created_at >= ? "
+            "ORDER BY url, created_at DESC",
+            ("u", "v", "2026-01-01"),
+        ),
+    ]
+    for query, params in queries:
+        plan = " ".join(
+            row[3] for row in db.execute(f"EXPLAIN QUERY PLAN {query}", params)
+        )
+        assert "idx_price_history_url_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_tracked_items_with_labels_single_query(test_db):
+    db = Database(test_db)
+    db.initialize()
+    repo = TrackedItemRepository(db)
+    label_repo = LabelRepository(db)
+
+    labelled = repo.insert(
+        TrackedItem(
+            product_id=1,
+            store_id=1,
+            url="https://example.com/labelled",
+            quantity_size=1.0,
+            quantity_unit="item",
+        )
+    )
+    bare = repo.insert(
+        TrackedItem(
+            product_id=1,
+            store_id=1,
+            url="https://example.com/bare",
+            quantity_size=1.0,
+            quantity_unit="item",
+        )
+    )
+    repo.set_labels(
+        labelled,
+        [label_repo.insert(Label(name="A")), label_repo.insert(Label(name="B"))],
+    )
+
+    result = repo.get_all_with_labels()
+
+    assert [item.id for item, _ in result] == [labelled, bare]
+    assert sorted(label.name for label in result[0][1]) == ["A", "B"]
+    assert result[1][1] == []
+    db.close()
+
+
+def test_dashboard_bulk_lookups(test_db):
+    db = Database(test_db)
+    db.initialize()
+    product_repo = ProductRepository(db)
+    store_repo = StoreRepository(db)
+    price_repo = PriceHistoryRepository(db)
+
+    p1 = product_repo.insert(Product(name="Milk"))
+    p2 = product_repo.insert(Product(name="Bread"))
+    s1 = store_repo.insert(Store(name="Shop"))
+    for url, price in [("https://a", 1.0), ("https://a", 2.0), ("https://b", 3.0)]:
+        price_repo.insert(
+            PriceHistoryRecord(
+                product_name="X", price=price, currency="EUR", confidence=1.0, url=url
+            )
+        )
+
+    products = product_repo.get_by_ids([p1, p2, 999])
+    assert {pid: p.name for pid, p in products.items()} == {p1: "Milk", p2: "Bread"}
+    assert list(store_repo.get_by_ids([s1])) == [s1]
+    assert product_repo.get_by_ids([]) == {}
+
+    histories = price_repo.get_histories_since(
+        ["https://a", "https://b", "https://c"], datetime.now() - timedelta(days=1)
+    )
+    assert len(histories["https://a"]) == 2  # noqa: PLR2004
+    assert [r.price for r in histories["https://b"]] == [3.0]
+    assert histories["https://c"] == []
+    db.close()
+
+
+def test_unit_count_usage(test_db):
+    db = Database(test_db)
+    db.initialize()
+    unit_repo = UnitRepository(db)
+    ProductRepository(db).insert(Product(name="Milk", target_unit="ml"))
+    TrackedItemRepository(db).insert(
+        TrackedItem(
+            product_id=1,
+            store_id=1,
+            url="https://example.com/ml",
+            quantity_size=500.0,
+            quantity_unit="ml",
+        )
+    )
+
+    assert unit_repo.count_usage("ml") == (1, 1)
+    assert unit_repo.count_usage("kg") == (0, 0)
+    db.close()
+
+
+def test_transaction_groups_repository_commits(test_db):
+    db = Database(test_db)
+    db.initialize()
+    store_repo = StoreRepository(db)
+
+    version = Database.data_version
+    with db.transaction():
+        store_repo.insert(Store(name="Shop A"))
+        store_repo.insert(Store(name="Shop B"))
+    assert Database.data_version == version + 1
+
+    with pytest.raises(RuntimeError), db.transaction():
+        store_repo.insert(Store(name="Shop C"))
+        raise RuntimeError("boom")
+
+    assert [s.name for s in store_repo.get_all()] == ["Shop A", "Shop B"]
+    db.close()
+
+
+def test_active_items_with_extraction_context(test_db):
+    db = Database(test_db)
+    db.initialize()
+    CategoryRepository(db).insert(Category(name="Shoes", is_size_sensitive=True))
+    product_repo = ProductRepository(db)
+    shoes_id = product_repo.insert(Product(name="Sneakers", category="Shoes"))
+    tracked_repo = TrackedItemRepository(db)
+    tracked_repo.insert(
+        TrackedItem(
+            product_id=shoes_id,
+            store_id=1,
+            url="https://example.com/sneakers",
+            target_size="42",
+            quantity_size=1.0,
+            quantity_unit="pair",
+        )
+    )
+    tracked_repo.insert(
+        TrackedItem(
+            product_id=999,
+            store_id=1,
+            url="https://example.com/orphan",
+            quantity_size=1.0,
+            quantity_unit="pair",
+        )
+    )
+    tracked_repo.insert(
+        TrackedItem(
+            product_id=shoes_id,
+            store_id=1,
+            url="https://example.com/paused",
+            quantity_size=1.0,
+            quantity_unit="pair",
+            is_active=False,
+        )
+    )
+
+    rows = tracked_repo.get_active_with_context()
+
+    assert [item.url for item, _ in rows] == [
+        "https://example.com/sneakers",
+        "https://example.com/orphan",
+    ]
+    sneakers_ctx, orphan_ctx = (ctx for _, ctx in rows)
+    assert sneakers_ctx.product_name == "Sneakers"
+    assert sneakers_ctx.category == "Shoes"
+    assert sneakers_ctx.is_size_sensitive
+    assert sneakers_ctx.target_size == "42"
+    assert orphan_ctx.product_name == "Unknown"
+    assert orphan_ctx.category is None
+    db.close()
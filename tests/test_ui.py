@@ -1,5 +1,11 @@
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
 
+from app.api.main import app
+from app.api.routers import ui
+from app.storage.database import Database
+
 HTTP_OK = 200
 
 # --- UI Pages (Integration) ---
@@ -73,3 +79,70 @@ def test_api_purchase_types_list(client: TestClient):
     response = client.get("/api/purchase-types")
     assert response.status_code == HTTP_OK
     assert isinstance(response.json(), list)
+
+
+def test_dashboard_cache_invalidated_by_writes(client: TestClient):
+    assert "Cached Oat Milk" not in client.get("/").text
+
+    product = client.post(
+        "/api/products", json={"name": "Cached Oat Milk", "category": "Dairy"}
+    ).json()
+    store = client.post("/api/stores", json={"name": "Cache Shop"}).json()
+    client.post(
+        "/api/tracked-items",
+        json={
+            "product_id": product["id"],
+            "store_id": store["id"],
+            "url": "https://example.com/cached",
+            "quantity_size": 1.0,
+            "quantity_unit": "L",
+        },
+    )
+
+    assert "Cached Oat Milk" in client.get("/").text
+
+
+def test_dashboard_served_from_refreshed_cache(client: TestClient, test_db):
+    db = Database(test_db)
+    db.initialize()
+    ui.refresh_dashboard_cache(db)
+    db.close()
+
+    with patch.object(ui, "_build_dashboard_context", side_effect=AssertionError):
+        response = client.get("/")
+    assert response.status_code == HTTP_OK
+
+
+def test_ui_routes_registered_once():
+    ui_paths = {route.path for route in ui.router.routes}
+    registered = [
+        (route.path, method)
+        for route in app.routes
+        if getattr(route, "path", None) in ui_paths
+        for method in getattr(route, "methods", None) or ()
+    ]
+    assert len(registered) == len(set(registered))
+
+
+def test_dashboard_with_only_paused_items_skips_onboarding(client: TestClient):
+    assert "No tracked items yet" in client.get("/").text
+
+    product = client.post(
+        "/api/products", json={"name": "Paused Milk", "category": "Dairy"}
+    ).json()
+    store = client.post("/api/stores", json={"name": "Paused Shop"}).json()
+    item = client.post(
+        "/api/tracked-items",
+        json={
+            "product_id": product["id"],
+            "store_id": store["id"],
+            "url": "https://example.com/paused",
+            "quantity_size": 1.0,
+            "quantity_unit": "L",
+        },
+    ).json()
+    client.patch(f"/api/tracked-items/{item['id']}", json={"is_active": False})
+
+    text = client.get("/").text
+    assert "No tracked items yet" not in text
+    assert "Paused Milk" not in text